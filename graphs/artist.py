@@ -6,9 +6,10 @@ Provides GObject based wrappers for mpl artists.
 """
 from itertools import islice
 
-from gi.repository import GObject, Graphs
+from gi.repository import GLib, GObject, Graphs
 
-from graphs import ast, misc, utilities
+from graphs import misc, utilities
+from graphs.singularities import find_singularities
 
 from matplotlib import artist, pyplot
 from matplotlib.figure import Figure
@@ -17,8 +18,14 @@ import numpy
 
 from scipy.stats import median_abs_deviation
 
-import sympy
-from sympy.calculus.singularities import singularities as find_singularities
+# Above this number of error bars only every n-th bar is drawn
+_ERRORBAR_LIMIT = 20000
+
+# Items whose data is scanned for singularity jumps by default
+_SINGULARITY_ITEMS = (Graphs.GeneratedDataItem,)
+
+# Gradient samples used to estimate the median absolute deviation
+_MAD_SAMPLE_SIZE = 100000
 
 
 def new_for_item(fig: Figure, item: Graphs.Item) -> GObject.Object:
@@ -36,13 +43,14 @@ def new_for_item(fig: Figure, item: Graphs.Item) -> GObject.Object:
         cls = TextItemArtistWrapper
     elif isinstance(item, Graphs.FillItem):
         cls = FillItemArtistWrapper
-    artist_wrapper = cls(
-        fig.axes[item.get_yposition() * 2 + item.get_xposition()],
-        item,
-    )
-    for prop in dir(artist_wrapper.props):
-        if not (prop == "label" and artist_wrapper.legend):
-            item.bind_property(prop, artist_wrapper, prop, 0)
+    axis = fig.axes[item.get_yposition() * 2 + item.get_xposition()]
+    artist_wrapper = cls(axis, item)
+    artist_wrapper.axis = axis
+    artist_wrapper._bindings = [
+        item.bind_property(prop, artist_wrapper, prop, 0)
+        for prop in dir(artist_wrapper.props)
+        if not (prop == "label" and artist_wrapper.legend)
+    ]
     artist_wrapper.connect("notify", lambda _x, _y: fig.update_legend())
     return artist_wrapper
 
@@ -52,11 +60,41 @@ class ItemArtistWrapper(GObject.Object):
 
     __gtype_name__ = "GraphsItemArtistWrapper"
     legend = False
+    _bindings = []
+    _draw_order = 0
 
     def get_artist(self) -> artist:
         """Get underlying mpl artist."""
         return self._artist
 
+    def get_artists(self) -> list[artist]:
+        """Get all mpl artists drawn for the item."""
+        return [self._artist]
+
+    def set_draw_order(self, draw_order: float) -> None:
+        """Offset the zorder of all artists to keep the item order."""
+        if draw_order == self._draw_order:
+            return
+        for handle in self.get_artists():
+            handle.set_zorder(handle.get_zorder() - self._draw_order
+                              + draw_order)
+        self._draw_order = draw_order
+
+    def disconnect_item(self) -> None:
+        """Release subscriptions to the item."""
+
+    def release(self) -> None:
+        """Release the property bindings and item subscriptions."""
+        for binding in self._bindings:
+            binding.unbind()
+        self._bindings = []
+        self.disconnect_item()
+
+    def remove(self) -> None:
+        """Release the item and remove the artists from the figure."""
+        self.release()
+        self._artist.remove()
+
     @GObject.Property(type=str, default="")
     def name(self) -> str:
         """Get name/label property."""
@@ -88,6 +126,56 @@ class ItemArtistWrapper(GObject.Object):
         self._artist.set_alpha(alpha)
 
 
+def _find_bad_points(
+    xdata: numpy.ndarray,
+    ydata: numpy.ndarray,
+) -> numpy.ndarray | None:
+    """
+    Find the points next to singularity jumps.
+
+    Jumps are detected using the Median Absolute Deviation of the gradient.
+    For large arrays the median and deviation are estimated on an evenly
+    strided sample of the gradient.
+    """
+    grad = numpy.abs(numpy.gradient(ydata, xdata))
+    sample = grad[::max(1, len(grad) // _MAD_SAMPLE_SIZE)]
+    median = numpy.median(sample)
+    mad = median_abs_deviation(sample, scale="normal")
+
+    if mad == 0:
+        mad = (xdata[1] - xdata[0]) * 0.01
+
+    threshold = median + 6 * mad
+    sign_change = numpy.sign(ydata[:-1]) != numpy.sign(ydata[1:])
+    mask = (grad[:-1] > threshold) & sign_change
+
+    if not numpy.any(mask):
+        return None
+
+    edges = numpy.diff(mask.astype(int))
+    starts = numpy.where(edges == 1)[0] + 1
+    ends = numpy.where(edges == -1)[0] + 1
+
+    if mask[0]:
+        starts = numpy.r_[0, starts]
+    if mask[-1]:
+        ends = numpy.r_[ends, len(mask)]
+
+    mask = numpy.zeros_like(mask, dtype=bool)
+    mask[(starts + ends) // 2] = True
+
+    bad_points = numpy.zeros(len(xdata), dtype=bool)
+    left = numpy.abs(ydata[:-1]) > numpy.abs(ydata[1:])
+    bad_points[:-1] |= mask & left
+    bad_points[1:] |= mask & ~left
+    return bad_points
+
+
+def _errorbar_step(length: int) -> int:
+    """Get the stride keeping the number of drawn error bars bounded."""
+    return max(1, -(-length // _ERRORBAR_LIMIT))
+
+
 class DataItemArtistWrapper(ItemArtistWrapper):
     """Wrapper for DataItem."""
 
@@ -105,22 +193,15 @@ class DataItemArtistWrapper(ItemArtistWrapper):
     @data.setter
     def data(self, data: Graphs.DataHolder) -> None:
         """Set data property."""
-        xdata, ydata, xerr, yerr = self._handle_singularities(data)
-        self._data.set_data((xdata, ydata))
-
-        if xerr is not None:
-            start = numpy.column_stack((xdata - xerr, ydata))
-            end = numpy.column_stack((xdata + xerr, ydata))
-            self._xbar.set_segments(numpy.stack((start, end), axis=1))
-            self._xcaps[0].set_data(xdata - xerr, ydata)
-            self._xcaps[1].set_data(xdata + xerr, ydata)
-
-        if yerr is not None:
-            start = numpy.column_stack((xdata, ydata - yerr))
-            end = numpy.column_stack((xdata, ydata + yerr))
-            self._ybar.set_segments(numpy.stack((start, end), axis=1))
-            self._ycaps[0].set_data(xdata, ydata - yerr)
-            self._ycaps[1].set_data(xdata, ydata + yerr)
+        self._values = self._handle_singularities(data)
+        self._data.set_data(self._values[:2])
+        for index, error in enumerate(self._values[2:]):
+            if error is None:
+                continue
+            self._stale_errors[index] = True
+            bar = self._xbar if index == 0 else self._ybar
+            if bar.get_visible():
+                self._update_errorbar(index)
 
     @GObject.Property(type=bool, default=True)
     def showxerr(self) -> bool:
@@ -130,6 +211,8 @@ class DataItemArtistWrapper(ItemArtistWrapper):
     @showxerr.setter
     def showxerr(self, showxerr: bool) -> None:
         """Set showxerr property."""
+        if showxerr and self._stale_errors[0]:
+            self._update_errorbar(0)
         self._xbar.set_visible(showxerr)
         for cap in self._xcaps:
             cap.set_visible(showxerr)
@@ -142,6 +225,8 @@ class DataItemArtistWrapper(ItemArtistWrapper):
     @showyerr.setter
     def showyerr(self, showyerr: bool) -> None:
         """Set showyerr property."""
+        if showyerr and self._stale_errors[1]:
+            self._update_errorbar(1)
         self._ybar.set_visible(showyerr)
         for cap in self._ycaps:
             cap.set_visible(showyerr)
@@ -230,6 +315,10 @@ class DataItemArtistWrapper(ItemArtistWrapper):
             cap.set_markerfacecolor(errcolor)
             cap.set_markeredgecolor(errcolor)
 
+    def get_artists(self) -> list[artist]:
+        """Get all mpl artists drawn for the item."""
+        return [self._data, *self._caps, *self._bars]
+
     def _set_properties(self, *_args) -> None:
         linewidth, markersize = self.props.linewidth, self.props.markersize
         if not self.props.selected:
@@ -238,72 +327,85 @@ class DataItemArtistWrapper(ItemArtistWrapper):
         self._data.set_linewidth(linewidth)
         self._data.set_markersize(markersize)
 
-    @staticmethod
-    def _handle_singularities(data: Graphs.DataHolder) -> tuple:
-        """Adjust data to handle singularity jumps."""
-        xdata = utilities.bytes_to_ndarray(data.get_xdata_b())
-        ydata = utilities.bytes_to_ndarray(data.get_ydata_b())
-        xerr = utilities.bytes_to_ndarray(data.get_xerr_b())
-        yerr = utilities.bytes_to_ndarray(data.get_yerr_b())
-
-        if len(xdata) < 2:
-            return xdata, ydata, xerr, yerr
-
-        # Detect singularities using Median Absolute Deviation
-        grad = numpy.abs(numpy.gradient(ydata, xdata))
-        median = numpy.median(grad)
-        mad = median_abs_deviation(grad, scale="normal")
+    def _update_errorbar(self, index: int) -> None:
+        """
+        Update the bars and caps of the x (0) or y (1) errors.
+
+        The segments are written into a buffer that is reused while the
+        number of bars stays the same. Large datasets only draw every n-th
+        bar.
+        """
+        self._stale_errors[index] = False
+        values = self._values
+        step = _errorbar_step(len(values[0]))
+        center = values[index][::step]
+        other = values[1 - index][::step]
+        error = values[index + 2][::step]
+
+        segments = self._segments[index]
+        if segments is None or len(segments) != len(center):
+            segments = numpy.empty((len(center), 2, 2))
+            self._segments[index] = segments
+        numpy.subtract(
+            center, error, out=segments[:, 0, index], dtype=numpy.float64,
+        )
+        numpy.add(
+            center, error, out=segments[:, 1, index], dtype=numpy.float64,
+        )
+        segments[:, 0, 1 - index] = other
+        segments[:, 1, 1 - index] = other
 
-        if mad == 0:
-            mad = (xdata[1] - xdata[0]) * 0.01
+        bar, caps = (
+            (self._xbar, self._xcaps) if index == 0
+            else (self._ybar, self._ycaps)
+        )
+        bar.set_segments(segments)
+        for end, cap in enumerate(caps):
+            cap.set_data(segments[:, end, 0], segments[:, end, 1])
 
-        threshold = median + 6 * mad
-        sign_change = numpy.sign(ydata[:-1]) != numpy.sign(ydata[1:])
-        mask = (grad[:-1] > threshold) & sign_change
+    def _handle_singularities(self, data: Graphs.DataHolder) -> tuple:
+        """Adjust data to handle singularity jumps."""
+        xdata, ydata, xerr, yerr = (
+            utilities.get_column(data, index) for index in range(4)
+        )
 
-        if not numpy.any(mask):
+        if not self.detect_singularities or len(xdata) < 2:
             return xdata, ydata, xerr, yerr
 
-        edges = numpy.diff(mask.astype(int))
-        starts = numpy.where(edges == 1)[0] + 1
-        ends = numpy.where(edges == -1)[0] + 1
-
-        if mask[0]:
-            starts = numpy.r_[0, starts]
-        if mask[-1]:
-            ends = numpy.r_[ends, len(mask)]
-
-        mask = numpy.zeros_like(mask, dtype=bool)
-        mask[(starts + ends) // 2] = True
-
-        bad_points = numpy.zeros(len(xdata), dtype=bool)
-        left = numpy.abs(ydata[:-1]) > numpy.abs(ydata[1:])
-        bad_points[:-1] |= mask & left
-        bad_points[1:] |= mask & ~left
+        # The mask is stored on the holder, so it is found once per data
+        computed, mask = data.get_bad_points()
+        if computed:
+            bad_points = utilities.bytes_to_ndarray(mask, dtype=bool)
+        else:
+            bad_points = _find_bad_points(xdata, ydata)
+            data.set_bad_points(
+                None if bad_points is None
+                else GLib.Bytes.new(bad_points.tobytes()),
+            )
+        if bad_points is None:
+            return xdata, ydata, xerr, yerr
 
-        xdata = xdata.copy()
-        ydata = ydata.copy()
+        # The error bars of removed points follow from the NaN coordinates
+        xdata = xdata.astype(numpy.float64)
+        ydata = ydata.astype(numpy.float64)
         xdata[bad_points] = numpy.nan
         ydata[bad_points] = numpy.nan
 
-        if xerr is not None:
-            xerr = xerr.copy()
-            xerr[bad_points] = numpy.nan
-
-        if yerr is not None:
-            yerr = yerr.copy()
-            yerr[bad_points] = numpy.nan
-
         return xdata, ydata, xerr, yerr
 
     def __init__(self, axis: pyplot.axis, item: Graphs.Item) -> None:
         super().__init__()
-        xdata, ydata, xerr, yerr = self._handle_singularities(item.props.data)
+        self.detect_singularities = isinstance(item, _SINGULARITY_ITEMS)
+        self._values = self._handle_singularities(item.props.data)
+        self._segments = [None, None]
+        self._stale_errors = [False, False]
+        xdata, ydata, xerr, yerr = self._values
+        step = _errorbar_step(len(xdata))
         self._artist = axis.errorbar(
-            xdata,
-            ydata,
-            xerr=xerr,
-            yerr=yerr,
+            xdata[::step],
+            ydata[::step],
+            xerr=None if xerr is None else xerr[::step],
+            yerr=None if yerr is None else yerr[::step],
             label=item.get_name(),
             color=item.get_color(),
             alpha=item.get_alpha(),
@@ -318,6 +420,8 @@ class DataItemArtistWrapper(ItemArtistWrapper):
 
         self._data, self._caps, self._bars = self._artist
         self._color_artist = self._data
+        if step > 1:
+            self._data.set_data((xdata, ydata))
 
         # We iterate over bar and caps in assignments to handle all
         # combinations with error bars on either or both axes.
@@ -352,13 +456,10 @@ class EquationItemArtistWrapper(ItemArtistWrapper):
     selected = GObject.Property(type=bool, default=True)
     linewidth = GObject.Property(type=float, default=3)
     legend = GObject.Property(type=bool, default=True)
-    _singularities_cache = {}
 
     def __init__(self, axis: pyplot.axis, item: Graphs.Item):
         super().__init__()
 
-        equation = item.get_equation()
-        self._expr = ast.sympify(equation)
         self._program = item.get_program()
         self._axis = axis
         self._view_change_timeout_id = None
@@ -407,9 +508,6 @@ class EquationItemArtistWrapper(ItemArtistWrapper):
 
     # We cannot have a Property of type Graphs.Ast
     def _on_equation_change(self, item, _pspec) -> None:
-        equation = item.get_equation()
-        self._singularities_cache = False
-        self._expr = ast.sympify(equation)
         self._program = item.get_program()
         self._generate_data()
 
@@ -445,7 +543,13 @@ class EquationItemArtistWrapper(ItemArtistWrapper):
             scale,
         )
         data = utilities.get_xy_data(holder)
-        singularities = self._find_singularities(lower, upper)
+        singularities = find_singularities(
+            self._item.get_equation(),
+            self._program,
+            lower,
+            upper,
+            scale,
+        )
         if singularities:
             data = self._insert_singularity_points(data, singularities)
 
@@ -453,31 +557,6 @@ class EquationItemArtistWrapper(ItemArtistWrapper):
         if self._axis.figure.parent is not None:
             self._axis.figure.parent.queue_draw()
 
-    def _find_singularities(self, lower, upper):
-        cached = self._singularities_cache
-        if cached:
-            cached_min, cached_max = cached["limits"]
-
-            if lower >= cached_min and upper <= cached_max:
-                return {
-                    s
-                    for s in cached["singularities"] if lower <= s <= upper
-                }
-
-            x_min, x_max = min(lower, cached_min), max(upper, cached_max)
-        else:
-            x_min, x_max = lower, upper
-
-        domain = sympy.Interval(x_min, x_max)
-        all_singularities = find_singularities(self._expr, misc.X, domain)
-
-        self._singularities_cache = {
-            "limits": (x_min, x_max),
-            "singularities": all_singularities,
-        }
-
-        return {s for s in all_singularities if lower <= s <= upper}
-
     def _insert_singularity_points(self, data, singularities) -> tuple:
         """Insert NaN and infinite value points at singularities."""
         xdata, ydata = data
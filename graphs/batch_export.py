@@ -0,0 +1,201 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""
+Headless batch export of projects.
+
+Renders the figures of Graphs projects without a window, using the Agg
+backend in a pool of worker processes::
+
+    python -m graphs.batch_export -f png -f pdf -o figures *.graphs
+
+Every worker loads the fonts and registers the custom scales once, and
+keeps parsed styles around for all projects it exports.
+"""
+import argparse
+import functools
+import logging
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from gi.repository import GLib, Gio, Graphs
+
+from graphs import figure_export, project, scales, style_io
+from graphs.figure import Figure
+from graphs.item import ItemFactory
+from graphs.styles import StyleParameters
+
+import matplotlib
+from matplotlib import font_manager
+
+FORMATS = ("png", "pdf", "svg")
+_STYLE_URI = "resource:///se/sjoerd/Graphs/styles/{name}.mplstyle"
+
+_item_factory = None
+
+
+def _init_worker() -> None:
+    """Set up matplotlib and the item factory in a worker process."""
+    logging.getLogger("matplotlib.font_manager").disabled = True
+    matplotlib.use("Agg", force=True)
+    for f in font_manager.findSystemFonts(fontpaths=None, fontext="ttf"):
+        try:
+            font_manager.fontManager.addfont(f)
+        except RuntimeError:
+            logging.warning("Could not load %s", f)
+    scales.register_scales()
+
+    # Kept alive for the lifetime of the worker
+    global _item_factory
+    _item_factory = ItemFactory()
+
+
+def _style_filename(name: str) -> str:
+    """Get the file name a style is stored under."""
+    for char in "()":
+        name = name.replace(char, "")
+    return name.replace(" ", "-").lower()
+
+
+@functools.cache
+def _get_style(name: str | None) -> StyleParameters:
+    """
+    Get the style parameters of a style name, None being the system style.
+
+    Styles are looked up in the bundled styles first, then in the user
+    style directory. Unknown styles fall back to the system style.
+    """
+    if name is None:
+        file = Gio.File.new_for_uri(_STYLE_URI.format(name="adwaita"))
+        return StyleParameters(style_io.parse(file))
+
+    system = _get_style(None).as_tuple()
+    filename = _style_filename(name)
+    style_dir = os.path.join(GLib.get_user_config_dir(), "graphs", "styles")
+    for file in (
+        Gio.File.new_for_uri(_STYLE_URI.format(name=filename)),
+        Gio.File.new_for_path(os.path.join(style_dir, filename + ".mplstyle")),
+    ):
+        if file.query_exists(None):
+            return StyleParameters(style_io.parse(file, system))
+    logging.warning("Style %s not found, using the system style", name)
+    return _get_style(None)
+
+
+def export_project(
+    path: str,
+    output_dir: str,
+    formats: list[str],
+    width: int,
+    height: int,
+    transparent: bool = False,
+    rasterize: str = "auto",
+    raster_dpi: int = 300,
+) -> list[str]:
+    """Export the figure of a project in every format, returning the paths."""
+    project_dict = project.read_project_file(Gio.File.new_for_path(path))
+    figure_settings = Graphs.FigureSettings(
+        **{
+            key.replace("-", "_"): value
+            for (key, value) in project_dict["figure-settings"].items()
+        },
+    )
+    items = Gio.ListStore.new(Graphs.Item)
+    for dictionary in project_dict["data"]:
+        items.append(ItemFactory.new_from_dict(dictionary))
+
+    use_custom_style = figure_settings.get_use_custom_style()
+    style = _get_style(
+        figure_settings.get_custom_style() if use_custom_style else None,
+    )
+
+    stem = os.path.splitext(os.path.basename(path))[0]
+    figure = Figure(style, items, figure_settings=figure_settings)
+    written = []
+    for fmt in formats:
+        destination = os.path.join(output_dir, f"{stem}.{fmt}")
+        with open(destination, "wb") as file_like:
+            figure_export.export_figure(
+                figure,
+                file_like,
+                fmt,
+                width,
+                height,
+                transparent=transparent,
+                rasterize=rasterize,
+                raster_dpi=raster_dpi,
+            )
+        written.append(destination)
+    figure.detach()
+    return written
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m graphs.batch_export",
+        description="Export the figures of Graphs projects.",
+    )
+    parser.add_argument("projects", nargs="+", help="project files")
+    parser.add_argument(
+        "-o", "--output-dir", default=".", help="directory to write to",
+    )
+    parser.add_argument(
+        "-f", "--format", dest="formats", action="append", choices=FORMATS,
+        help="file format, can be repeated (default: png)",
+    )
+    parser.add_argument("--width", type=int, default=800)
+    parser.add_argument("--height", type=int, default=600)
+    parser.add_argument("--transparent", action="store_true")
+    parser.add_argument(
+        "--rasterize", choices=("auto", "always", "never"), default="auto",
+        help="rasterize the data of vector formats",
+    )
+    parser.add_argument("--raster-dpi", type=int, default=300)
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=None,
+        help="number of worker processes (default: number of CPUs)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] = None) -> int:
+    """Run the batch export, returning the exit status."""
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
+    logging.basicConfig(format="%(levelname)s: %(message)s")
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    failed = 0
+    with ProcessPoolExecutor(
+        max_workers=args.jobs,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+    ) as executor:
+        futures = {
+            executor.submit(
+                export_project,
+                path,
+                args.output_dir,
+                args.formats or ["png"],
+                args.width,
+                args.height,
+                args.transparent,
+                args.rasterize,
+                args.raster_dpi,
+            ): path
+            for path in args.projects
+        }
+        for future in as_completed(futures):
+            try:
+                for destination in future.result():
+                    print(destination)
+            except Exception as e:
+                failed += 1
+                message = getattr(e, "message", str(e))
+                logging.error(
+                    "Could not export %s: %s", futures[future], message,
+                )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,22 +6,189 @@ Acts as an interface between matplotlib and GObject and contains a custom
 implementation of a `SpanSelector` as well as a dummy toolbar used for
 interactive navigation in conjunction with graphs-specific structures.
 """
+import copy
+import logging
 import math
+import threading
+import weakref
+from collections.abc import Callable
 
-from gi.repository import Adw, Gdk, Gio, Graphs, Gtk
+import cairo
 
-from graphs.figure import Figure
+from gi.repository import Adw, GLib, Gdk, Gio, Graphs, Gtk
 
-from matplotlib import backend_tools as tools
+from graphs.figure import Figure, count_vertices
+
+from matplotlib import backend_tools as tools, cbook
+from matplotlib.artist import Artist
 from matplotlib.backend_bases import (
     FigureCanvasBase,
     MouseEvent,
     NavigationToolbar2,
 )
+from matplotlib.backends.backend_agg import RendererAgg
 from matplotlib.backends.backend_gtk4cairo import FigureCanvas
+from matplotlib.collections import Collection
+from matplotlib.lines import Line2D
+from matplotlib.transforms import Affine2D, IdentityTransform
 from matplotlib.widgets import SpanSelector
 
+import numpy
+
 _SCROLL_SCALE = 1.08
+# Delay in ms after the last wheel event that ends an interaction, as wheels
+# do not emit scroll-end.
+_INTERACTION_TIMEOUT = 200
+# Total number of data vertices above which data is rendered with Agg
+_HYBRID_VERTEX_THRESHOLD = 100000
+
+
+def _to_premultiplied_argb32(rgba: numpy.ndarray) -> numpy.ndarray:
+    """Convert an unmultiplied RGBA8888 image to cairo's ARGB32 format."""
+    rgba = rgba.astype(numpy.uint32)
+    alpha = rgba[..., 3]
+    red, green, blue = (
+        (rgba[..., channel] * alpha + 127) // 255 for channel in range(3)
+    )
+    # ARGB32 stores every pixel as a native-endian 32 bit integer
+    return alpha << 24 | red << 16 | green << 8 | blue
+
+
+def _render_agg(
+    artists: list,
+    width: int,
+    height: int,
+    dpi: float,
+) -> cairo.ImageSurface:
+    """Render artists with Agg into a cairo surface."""
+    renderer = RendererAgg(width, height, dpi)
+    for handle in sorted(artists, key=lambda a: a.get_zorder()):
+        handle.draw(renderer)
+    data = _to_premultiplied_argb32(numpy.asarray(renderer.buffer_rgba()))
+    return cairo.ImageSurface.create_for_data(
+        data.ravel().data,
+        cairo.FORMAT_ARGB32,
+        width,
+        height,
+    )
+
+
+def _snapshot_artist(handle: Artist) -> Artist:
+    """
+    Copy an artist detached from the live figure state.
+
+    Transforms and clips are frozen, the data arrays, paths and their
+    caches are copied and the copy is detached from the axes, so it can be
+    drawn from another thread without reading state of the live figure.
+    """
+    clone = copy.copy(handle)
+    clone._callbacks = cbook.CallbackRegistry(signals=["pchanged"])
+    # Changes to the copy must not mark the live axes as stale
+    clone.stale_callback = None
+    clone.set_transform(handle.get_transform().frozen())
+    clipbox = handle.get_clip_box()
+    if clipbox is not None:
+        clone.set_clip_box(clipbox.frozen())
+    clippath = handle.get_clip_path()
+    if clippath is not None:
+        clone.set_clip_path(
+            clippath.get_fully_transformed_path(),
+            IdentityTransform(),
+        )
+    if isinstance(handle, Line2D):
+        # Subslicing reads the live axes bounds
+        clone._subslice = False
+        clone.set_data(
+            numpy.array(handle.get_xdata(orig=True)),
+            numpy.array(handle.get_ydata(orig=True)),
+        )
+        clone.recache(always=True)
+    elif isinstance(handle, Collection):
+        clone.set_offset_transform(handle.get_offset_transform().frozen())
+        clone.set_offsets(numpy.array(handle.get_offsets()))
+        clone._paths = copy.deepcopy(handle.get_paths())
+        clone._transforms = numpy.array(handle.get_transforms())
+    # Unit conversion and subslicing read the live axes, the data is already
+    # converted and the transforms are frozen above.
+    clone._axes = None
+    return clone
+
+
+class _RenderScheduler:
+    """
+    Render frames on a worker thread.
+
+    Only the latest submitted job is rendered. Jobs that are superseded
+    before they start are dropped, and results that are outdated when they
+    finish are discarded instead of being committed on the main thread.
+
+    The commit callback is only referenced weakly, so the scheduler does not
+    keep its owner alive, and the worker thread ends with `shutdown`. Jobs
+    that raise are logged and commit None, so the owner can fall back to
+    rendering on the main thread while the worker keeps running.
+    """
+
+    def __init__(self, commit: Callable[[object], None]):
+        self._commit = weakref.WeakMethod(commit)
+        self._condition = threading.Condition()
+        self._pending = None
+        self._generation = 0
+        self._thread = None
+        self._stop = None
+
+    def submit(self, job: Callable[[], object]) -> None:
+        """Schedule a job, replacing any job that has not started yet."""
+        with self._condition:
+            self._generation += 1
+            self._pending = (self._generation, job)
+            if self._thread is None:
+                self._stop = threading.Event()
+                self._thread = threading.Thread(
+                    target=self._run,
+                    args=(self._stop,),
+                    daemon=True,
+                )
+                self._thread.start()
+            self._condition.notify()
+
+    def discard(self) -> None:
+        """Drop the pending job and all results still being rendered."""
+        with self._condition:
+            self._generation += 1
+            self._pending = None
+
+    def shutdown(self) -> None:
+        """Drop all jobs and let the worker thread return."""
+        with self._condition:
+            self._generation += 1
+            self._pending = None
+            if self._thread is not None:
+                self._stop.set()
+                self._thread = None
+                self._stop = None
+            self._condition.notify_all()
+
+    def _run(self, stop: threading.Event) -> None:
+        while True:
+            with self._condition:
+                while self._pending is None and not stop.is_set():
+                    self._condition.wait()
+                if stop.is_set():
+                    return
+                generation, job = self._pending
+                self._pending = None
+            try:
+                result = job()
+            except Exception:
+                logging.exception("Rendering on the worker thread failed")
+                result = None
+            GLib.idle_add(self._on_rendered, generation, result)
+
+    def _on_rendered(self, generation: int, result) -> bool:
+        commit = self._commit()
+        if commit is not None and generation == self._generation:
+            commit(result)
+        return False
 
 
 class Canvas(Graphs.Canvas, FigureCanvas):
@@ -51,12 +218,19 @@ class Canvas(Graphs.Canvas, FigureCanvas):
         figure = Figure(style_params, items, self, figure_settings)
         self.props.figure = figure
         self._idle_draw_id = 0
+        self._interaction_layers = None
+        self._interaction_artists = []
+        self._interaction_timeout_id = 0
+        self._data_layers = {}
+        self._interaction_key = None
+        self._scheduler = _RenderScheduler(self._on_interaction_frame)
         self.set_draw_func(self._draw_func)
         FigureCanvasBase.__init__(self, figure=figure)
         self._rubberband_rect = None
 
         self.connect("notify::scale-factor", self._update_device_pixel_ratio)
         self.connect("resize", self._on_resize)
+        self.connect("unrealize", self._on_unrealize)
 
         # Handle stuff only used if the canvas is interactive
         if interactive:
@@ -90,6 +264,7 @@ class Canvas(Graphs.Canvas, FigureCanvas):
         )
         scroll.connect("scroll", self.scroll_event)
         scroll.connect("scroll-end", self.toolbar.push_current)
+        scroll.connect("scroll-end", self._end_interaction)
         self.add_controller(scroll)
 
         zoom = Gtk.GestureZoom.new()
@@ -179,6 +354,13 @@ class Canvas(Graphs.Canvas, FigureCanvas):
         - X-limits: _axis and _top_left_axis (independent x ax.)
         - Y-limits: _axis, _right_axis, and _top_right_axis (independent y ax.)
         """
+        self._begin_interaction()
+        if self._interaction_timeout_id:
+            GLib.source_remove(self._interaction_timeout_id)
+        self._interaction_timeout_id = GLib.timeout_add(
+            _INTERACTION_TIMEOUT,
+            self._on_interaction_timeout,
+        )
         if self._ctrl_held:
             self.zoom(1 / _SCROLL_SCALE if dy > 0 else _SCROLL_SCALE)
         else:
@@ -188,6 +370,8 @@ class Canvas(Graphs.Canvas, FigureCanvas):
                 dx *= 10
                 dy *= 10
 
+            # Pending limits were applied when beginning the interaction
+
             for ax in [self.figure.axis, self.figure.top_left_axis]:
                 xmin, xmax = ax.get_xlim()
                 scale = Graphs.scale_from_string(ax.get_xscale())
@@ -213,6 +397,7 @@ class Canvas(Graphs.Canvas, FigureCanvas):
         scale: float,
     ) -> None:
         """Handle zoom event."""
+        self._begin_interaction()
         coords = controller.get_bounding_box_center()
         x, y = coords.x, coords.y
         event = MouseEvent(
@@ -243,6 +428,163 @@ class Canvas(Graphs.Canvas, FigureCanvas):
             1,
         )._process()
         self.toolbar.push_current()
+        self._end_interaction()
+
+    def _begin_interaction(self) -> None:
+        """
+        Start an interactive gesture.
+
+        Render the data artists of every axis into a cached layer once and
+        exclude them from regular draws, so frames during the gesture only
+        draw the static parts and transform the cached layers. The layers
+        are drawn at the zorder of the data artists, so grid lines, spines
+        and legends keep their place in the image.
+        """
+        self.figure.flush_pending()
+        if self._interaction_layers is not None:
+            return
+        width, height = (int(dim) for dim in self.figure.bbox.size)
+        if width <= 0 or height <= 0:
+            return
+
+        layers = {}
+        for axis, artists in self.figure.get_data_artists().items():
+            if not artists:
+                continue
+            layer = _InteractionLayer()
+            layer.set_zorder(min(handle.get_zorder() for handle in artists))
+            layer.set_frame(
+                _render_agg(artists, width, height, self.figure.dpi),
+                (axis.transLimits + axis.transAxes).frozen(),
+            )
+            axis.add_artist(layer)
+            for handle in artists:
+                handle.set_animated(True)
+            self._interaction_artists.extend(artists)
+            layers[axis] = layer
+        self._interaction_layers = layers
+        self._interaction_key = self._get_view_key()
+        self.figure.freeze_layout(True)
+
+    def _end_interaction(self, *_args) -> None:
+        """End an interactive gesture and queue a full redraw."""
+        if self._interaction_timeout_id:
+            GLib.source_remove(self._interaction_timeout_id)
+            self._interaction_timeout_id = 0
+        if self._interaction_layers is None:
+            return
+        self._scheduler.discard()
+        for handle in self._interaction_artists:
+            handle.set_animated(False)
+        for layer in self._interaction_layers.values():
+            layer.remove()
+        self._interaction_layers = None
+        self._interaction_artists = []
+        self.figure.freeze_layout(False)
+        self.queue_draw()
+
+    def _get_view_key(self) -> tuple:
+        return tuple(tuple(axis.viewLim.bounds) for axis in self.figure.axes)
+
+    def _request_interaction_frame(self) -> None:
+        """Render the data layers at the current view on the worker thread."""
+        key = self._get_view_key()
+        if key == self._interaction_key:
+            return
+        self._interaction_key = key
+
+        width, height = (int(dim) for dim in self.figure.bbox.size)
+        dpi = self.figure.dpi
+        snapshot = [
+            (
+                axis,
+                [_snapshot_artist(handle) for handle in artists],
+                (axis.transLimits + axis.transAxes).frozen(),
+            )
+            for axis, artists in self.figure.get_data_artists().items()
+        ]
+
+        def render():
+            return [
+                (axis, _render_agg(artists, width, height, dpi), transform)
+                for axis, artists, transform in snapshot
+            ]
+
+        self._scheduler.submit(render)
+
+    def _on_interaction_frame(self, layers: list | None) -> None:
+        """Show the latest frame rendered on the worker thread."""
+        if self._interaction_layers is None:
+            return
+        if layers is None:
+            # Rendering on the worker failed, render the frame here instead
+            width, height = (int(dim) for dim in self.figure.bbox.size)
+            layers = [
+                (
+                    axis,
+                    _render_agg(artists, width, height, self.figure.dpi),
+                    (axis.transLimits + axis.transAxes).frozen(),
+                )
+                for axis, artists in self.figure.get_data_artists().items()
+                if artists
+            ]
+        for axis, surface, transform in layers:
+            layer = self._interaction_layers.get(axis, None)
+            if layer is not None:
+                layer.set_frame(surface, transform)
+        self.queue_draw()
+
+    def _on_unrealize(self, _widget) -> None:
+        """Stop interactions and the render thread when torn down."""
+        self._end_interaction()
+        self._scheduler.shutdown()
+
+    def _on_interaction_timeout(self) -> bool:
+        self._interaction_timeout_id = 0
+        self._end_interaction()
+        return False
+
+    # Overwritten function - do not change name
+    def on_draw_event(self, widget, ctx) -> None:
+        """Draw the figure, transforming cached layers while interacting."""
+        self.figure.flush_pending()
+        if self._interaction_layers is None:
+            data_artists = self.figure.get_data_artists()
+            if count_vertices(data_artists) > _HYBRID_VERTEX_THRESHOLD:
+                self._draw_hybrid(widget, ctx, data_artists)
+            else:
+                self._data_layers = {}
+                super().on_draw_event(widget, ctx)
+            return
+
+        super().on_draw_event(widget, ctx)
+        self._request_interaction_frame()
+
+    def _draw_hybrid(self, widget, ctx, data_artists: dict) -> None:
+        """
+        Draw the figure with the data rendered by Agg.
+
+        The data artists of every axis are replaced by a layer holding an Agg
+        raster at their zorder, so axes, text and legends are still drawn
+        with cairo on top of them.
+        """
+        layers = {}
+        for axis, artists in data_artists.items():
+            layer = self._data_layers.get(axis, None) or _DataLayer()
+            layer.set_data_artists(artists)
+            axis.add_artist(layer)
+            for handle in artists:
+                handle.set_animated(True)
+            layers[axis] = layer
+        self._data_layers = layers
+
+        try:
+            super().on_draw_event(widget, ctx)
+        finally:
+            for axis, layer in layers.items():
+                layer.remove()
+                for handle in data_artists[axis]:
+                    handle.set_animated(False)
 
     def enter_notify_event(
         self,
@@ -257,20 +599,11 @@ class Canvas(Graphs.Canvas, FigureCanvas):
     def _set_mouse_fraction(self, event) -> None:
         """Set the mouse coordinate in terms of fraction of the canvas."""
         if event.inaxes is not None:
-            xlim = self.figure.top_right_axis.get_xlim()
-            ylim = self.figure.top_right_axis.get_ylim()
-            self._xfrac = Graphs.get_fraction_at_value(
-                event.xdata,
-                xlim[0],
-                xlim[1],
-                self.figure.props.top_scale,
-            )
-            self._yfrac = Graphs.get_fraction_at_value(
-                event.ydata,
-                ylim[0],
-                ylim[1],
-                self.figure.props.right_scale,
-            )
+            # Taken from the pixel position, as limits set on the figure are
+            # only applied to the axes before the next paint
+            bbox = self.figure.top_right_axis.bbox
+            self._xfrac = (event.x - bbox.x0) / bbox.width
+            self._yfrac = (event.y - bbox.y0) / bbox.height
         else:
             self._xfrac, self._yfrac = None, None
 
@@ -284,6 +617,7 @@ class Canvas(Graphs.Canvas, FigureCanvas):
         - X-limits: _axis and _top_left_axis (independent x-ax.)
         - Y-limits: _axis, _right_axis, and _top_right_axis (independent y-ax.)
         """
+        self.figure.flush_pending()
         if not respect_mouse:
             self._xfrac, self._yfrac = 0.5, 0.5
         if self._xfrac is None or self._yfrac is None:
@@ -504,6 +838,17 @@ class _DummyToolbar(NavigationToolbar2):
             self.canvas.set_cursor(tools.Cursors.POINTER)
             self._last_cursor = tools.Cursors.POINTER
 
+    # Overwritten function - do not change name
+    def press_pan(self, event) -> None:
+        self.canvas.figure.flush_pending()
+        super().press_pan(event)
+        self.canvas._begin_interaction()
+
+    # Overwritten function - do not change name
+    def release_pan(self, event) -> None:
+        super().release_pan(event)
+        self.canvas._end_interaction()
+
     # Overwritten function - do not change name
     def drag_pan(self, event) -> None:
         """Handle dragging in pan/zoom mode."""
@@ -566,6 +911,102 @@ class _DummyToolbar(NavigationToolbar2):
         pass
 
 
+class _DataLayer(Artist):
+    """
+    Artist drawing the data artists of an axis from an Agg raster.
+
+    The raster is only rendered again when the canvas, the axis or one of the
+    data artists changed, so redraws that only update overlays such as the
+    rubberband reuse it.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._artists = []
+        self._surface = None
+        self._key = None
+
+    def set_data_artists(self, artists: list) -> None:
+        """Set the artists drawn by the layer."""
+        self._artists = artists
+        self.set_zorder(min(handle.get_zorder() for handle in artists))
+
+    def draw(self, renderer) -> None:
+        """Draw the cached raster, rendering it first if outdated."""
+        axis = self.axes
+        width, height = renderer.get_canvas_width_height()
+        width, height = int(width), int(height)
+        key = (
+            width,
+            height,
+            renderer.dpi,
+            tuple(axis.bbox.bounds),
+            tuple(axis.viewLim.bounds),
+            axis.get_xscale(),
+            axis.get_yscale(),
+            tuple(id(handle) for handle in self._artists),
+        )
+        if key != self._key or any(a.stale for a in self._artists):
+            self._surface = _render_agg(
+                self._artists,
+                width,
+                height,
+                renderer.dpi,
+            )
+            self._key = key
+
+        ctx = renderer.gc.ctx
+        ctx.save()
+        ctx.set_source_surface(self._surface, 0, 0)
+        ctx.paint()
+        ctx.restore()
+        self.stale = False
+
+
+class _InteractionLayer(Artist):
+    """
+    Artist drawing a cached data raster during interactive gestures.
+
+    The raster was rendered at the view of its frame transform and is
+    transformed to the current view of the axis when drawn.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._surface = None
+        self._transform = None
+
+    def set_frame(self, surface: cairo.ImageSurface, transform) -> None:
+        """Set the raster and the axis transform it was rendered at."""
+        self._surface = surface
+        self._transform = transform
+        self.stale = True
+
+    def draw(self, renderer) -> None:
+        """Draw the raster transformed to the current view."""
+        axis = self.axes
+        height = self.figure.bbox.height
+        flip = Affine2D().scale(1, -1).translate(0, height)
+        current = axis.transLimits + axis.transAxes
+        matrix = flip + self._transform.inverted() + current + flip
+        matrix = matrix.get_matrix()
+        x0, y0, x1, y1 = axis.bbox.extents
+
+        ctx = renderer.gc.ctx
+        ctx.save()
+        ctx.rectangle(x0, height - y1, x1 - x0, y1 - y0)
+        ctx.clip()
+        ctx.transform(cairo.Matrix(
+            matrix[0, 0], matrix[1, 0],
+            matrix[0, 1], matrix[1, 1],
+            matrix[0, 2], matrix[1, 2],
+        ))
+        ctx.set_source_surface(self._surface, 0, 0)
+        ctx.paint()
+        ctx.restore()
+        self.stale = False
+
+
 class _Highlight(SpanSelector):
 
     def __init__(self, canvas: Canvas):
@@ -591,7 +1032,8 @@ class _Highlight(SpanSelector):
         self.load(canvas)
 
     def load(self, canvas: Canvas) -> None:
-        xmin, xmax = canvas.figure.top_left_axis.get_xlim()
+        xmin = canvas.figure.props.min_top
+        xmax = canvas.figure.props.max_top
         scale = canvas.figure.props.top_scale
         self.extents = (
             Graphs.get_value_at_fraction(
@@ -609,7 +1051,8 @@ class _Highlight(SpanSelector):
         )
 
     def apply(self, canvas: Canvas) -> None:
-        xmin, xmax = canvas.figure.top_left_axis.get_xlim()
+        xmin = canvas.figure.props.min_top
+        xmax = canvas.figure.props.max_top
         low, high = self.extents
         self.extents = max(xmin, low), min(xmax, high)
 
@@ -1,10 +1,11 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 """Curve fitting module."""
+from collections.abc import Callable
 from gettext import gettext as _
 
-from gi.repository import Gio, Graphs
+from gi.repository import GLib, Gio, Graphs
 
-from graphs import ast, canvas
+from graphs import ast, canvas, utilities
 from graphs.item import DataItem, FillItem
 
 import numpy
@@ -114,15 +115,23 @@ class CurveFittingDialog(Graphs.CurveFittingDialog):
 
         try:
             symbolic = ast.sympify(expression)
-            func = sympy.lambdify(sym_vars, symbolic, modules="scipy")
+            program = Graphs.ast_to_multi_program(
+                expression, ["x"], free_vars,
+            )
+
+            def func(xdata, *params):
+                return utilities.evaluate_program(program, (xdata,), params)
+
+            jac = self._compile_jacobian(symbolic, sym_vars, free_vars)
             params, param_cov = curve_fit(
                 func, x_data, y_data,
                 p0=self.get_p0(),
+                jac=jac,
                 bounds=self.get_bounds(),
                 nan_policy="omit",
                 method=settings.get_string("optimization"),
             )
-        except (sympy.SympifyError, TypeError, SyntaxError):
+        except (GLib.Error, sympy.SympifyError, TypeError, SyntaxError):
             self.set_results(Graphs.CurveFittingError.EQUATION)
             return
         except (RuntimeError, _minpack.error):
@@ -155,22 +164,23 @@ class CurveFittingDialog(Graphs.CurveFittingDialog):
 
         x_fit = self._x_fit
         y_fit = func(x_fit, *params)
-        if numpy.ndim(y_fit) == 0:
-            y_fit = numpy.full(x_fit.size, y_fit.item())
 
         self.fitted_curve.set_xydata((x_fit, y_fit))
         self.fitted_curve.set_name(f"Y = {fitted_eq}")
 
         # Calculate and update confidence band for error propagation.
-        jacobian = numpy.column_stack([
-            numpy.full(x_fit.size, g) if numpy.ndim(
-                g := sympy.lambdify(
-                    sym_vars,
-                    sympy.diff(symbolic, sym_params_map[name]),
-                    modules="scipy",
-                )(x_fit, *params),
-            ) == 0 else g for name in free_vars
-        ])
+        if jac is not None:
+            jacobian = jac(x_fit, *params)
+        else:
+            jacobian = numpy.column_stack([
+                numpy.full(x_fit.size, g) if numpy.ndim(
+                    g := sympy.lambdify(
+                        sym_vars,
+                        sympy.diff(symbolic, sym_params_map[name]),
+                        modules="scipy",
+                    )(x_fit, *params),
+                ) == 0 else g for name in free_vars
+            ])
         variance = numpy.sum(jacobian * (jacobian @ param_cov), axis=1)
 
         std_dev_y = numpy.sqrt(numpy.abs(variance))
@@ -209,6 +219,38 @@ class CurveFittingDialog(Graphs.CurveFittingDialog):
 
         self.set_results(Graphs.CurveFittingError.NONE)
 
+    @staticmethod
+    def _compile_jacobian(
+        symbolic: sympy.Expr,
+        sym_vars: tuple,
+        free_vars: list[str],
+    ) -> Callable | None:
+        """
+        Compile the partial derivatives to all free variables.
+
+        Returns None if a derivative cannot be compiled, in which case the
+        Jacobian is estimated by finite differences instead.
+        """
+        programs = []
+        try:
+            for sym_var in sym_vars[1:]:
+                derivative = sympy.diff(symbolic, sym_var)
+                programs.append(Graphs.ast_to_multi_program(
+                    Graphs.expression_to_ast(str(derivative)),
+                    ["x"],
+                    free_vars,
+                ))
+        except GLib.Error:
+            return None
+
+        def jac(xdata, *params):
+            return numpy.column_stack([
+                utilities.evaluate_program(program, (xdata,), params)
+                for program in programs
+            ])
+
+        return jac
+
     def _clear_fit(self) -> None:
         """Clear all fit-related data by hiding curves."""
         cv = self.get_residuals_canvas()
@@ -5,19 +5,72 @@ import logging
 from collections import OrderedDict
 from collections.abc import Iterator
 from gettext import gettext as _
+from itertools import repeat
 from operator import itemgetter
 
 from gi.repository import Gio, Graphs, Gtk
 
-from graphs import misc, project
+from graphs import misc, project, utilities
 from graphs.item import ItemFactory
 
+import numpy
+
 _FIGURE_SETTINGS_HISTORY_IGNORELIST = misc.LIMITS + [
     "min-selected",
     "max-selected",
 ]
 
 
+def _values_equal(value1, value2) -> bool:
+    """Compare two history values, which may hold data arrays."""
+    sequences = (list, tuple)
+    if isinstance(value1, sequences) and isinstance(value2, sequences):
+        return len(value1) == len(value2) \
+            and all(map(_values_equal, value1, value2))
+    if isinstance(value1, numpy.ndarray) or isinstance(value2, numpy.ndarray):
+        if value1 is None or value2 is None:
+            return False
+        return numpy.array_equal(value1, value2)
+    return value1 == value2
+
+
+def _data_types(data) -> list[str]:
+    """Get the type names of the columns of a data tuple."""
+    return [
+        "float64" if column is None else numpy.asarray(column).dtype.name
+        for column in data
+    ]
+
+
+def _data_to_columns(dictionary: dict) -> None:
+    """Replace the data lists of an item dict with readonly columns."""
+    if "data" not in dictionary:
+        return
+    data_types = dictionary.get("data_types", repeat(numpy.float64))
+    dictionary["data"] = list(
+        map(utilities.to_column, dictionary["data"], data_types),
+    )
+
+
+def _history_to_columns(history_states: list) -> None:
+    """Replace the data lists read from a project file with columns."""
+    for batch, _limits in history_states:
+        for change_type, change in batch:
+            match change_type:
+                case Graphs.ChangeType.ITEM_PROPERTY_CHANGED:
+                    if change[1] != "data":
+                        continue
+                    # Data changes end with the column types of both values
+                    for pos, types in zip((2, 3), change[4:6]):
+                        change[pos] = list(
+                            map(utilities.to_column, change[pos], types),
+                        )
+                case Graphs.ChangeType.ITEM_ADDED:
+                    _data_to_columns(change)
+                case Graphs.ChangeType.ITEM_REMOVED:
+                    _data_to_columns(change[1])
+
+
 class Data(Graphs.Data):
     """Class for managing data."""
 
@@ -30,6 +83,7 @@ class Data(Graphs.Data):
         self.connect("item-changed", self._on_item_changed)
         self.connect("item-added", self._on_item_added)
         self.connect("item-removed", self._on_item_removed)
+        self.connect("items-selected", self._on_items_selected)
         self.connect(
             "figure-settings-changed",
             self._on_figure_settings_changed,
@@ -83,20 +137,35 @@ class Data(Graphs.Data):
     @staticmethod
     def _on_item_changed(self, item: Graphs.Item, prop: str) -> None:
         index = self.index(item)
+        old_value = copy.deepcopy(self._data_copy[index][prop])
         if prop == "data":
             value = item.get_data_tuple()
         elif prop == "equation":
             value = Graphs.ast_to_expression(item.get_property(prop))
         else:
             value = item.get_property(prop)
+        change = (index, prop, old_value, value)
+        if prop == "data":
+            # Project files only keep the values, so keep the types as well
+            change += (_data_types(old_value), _data_types(value))
         self._current_batch.append((
             Graphs.ChangeType.ITEM_PROPERTY_CHANGED,
-            (
-                index,
-                prop,
-                copy.deepcopy(self._data_copy[index][prop]),
-                value,
-            ),
+            change,
+        ))
+
+    @staticmethod
+    def _on_items_selected(
+        self,
+        changed: Gtk.Bitset,
+        selected: Gtk.Bitset,
+    ) -> None:
+        positions = [changed.get_nth(n) for n in range(changed.get_size())]
+        values = [selected.contains(index) for index in positions]
+        for index, value in zip(positions, values):
+            self._data_copy[index]["selected"] = value
+        self._current_batch.append((
+            Graphs.ChangeType.ITEMS_SELECTED,
+            (positions, values),
         ))
 
     @staticmethod
@@ -144,19 +213,24 @@ class Data(Graphs.Data):
         for change_type, data in self._current_batch:
             match change_type:
                 case Graphs.ChangeType.ITEM_PROPERTY_CHANGED:
-                    index, prop, _old_value, new_value = data
+                    index, prop, _old_value, new_value = data[:4]
                     key = (change_type, index, prop)
 
                     if key not in collapsed:
                         collapsed[key] = (change_type, data)
                     else:
-                        first_old = collapsed[key][1][2]
-                        if first_old == new_value:
+                        first = collapsed[key][1]
+                        first_old = first[2]
+                        if _values_equal(first_old, new_value):
                             collapsed.pop(key)
                         else:
+                            # Data changes also hold the old and new types
                             collapsed[key] = (
                                 Graphs.ChangeType.ITEM_PROPERTY_CHANGED,
-                                (index, prop, first_old, new_value),
+                                (
+                                    index, prop, first_old, new_value,
+                                    *first[4:5], *data[5:],
+                                ),
                             )
 
                 case Graphs.ChangeType.FIGURE_SETTINGS_CHANGED:
@@ -167,7 +241,7 @@ class Data(Graphs.Data):
                         collapsed[key] = (change_type, data)
                     else:
                         first_old = collapsed[key][1][1]
-                        if first_old == new_value:
+                        if _values_equal(first_old, new_value):
                             collapsed.pop(key)
                         else:
                             collapsed[key] = (
@@ -176,8 +250,8 @@ class Data(Graphs.Data):
                             )
 
                 case _:
-                    # On any other change such as items added or removed we
-                    # abort collapsing
+                    # On any other change such as items added or removed or
+                    # a bulk selection change we abort collapsing
                     return
 
         self._current_batch = list(collapsed.values())
@@ -239,6 +313,13 @@ class Data(Graphs.Data):
                         change[0],
                         change[1],
                     )
+                case Graphs.ChangeType.ITEMS_SELECTED:
+                    for index, value in zip(*change):
+                        mask.add(index)
+                        if value:
+                            selected.remove(index)
+                        else:
+                            selected.add(index)
         self.set_selection(selected, mask)
         limits = Graphs.Limits.new(self._history_states[self._history_pos][1])
         self.get_figure_settings().set_limits(limits)
@@ -284,6 +365,13 @@ class Data(Graphs.Data):
                         change[0],
                         change[2],
                     )
+                case Graphs.ChangeType.ITEMS_SELECTED:
+                    for index, value in zip(*change):
+                        mask.add(index)
+                        if value:
+                            selected.add(index)
+                        else:
+                            selected.remove(index)
         self.set_selection(selected, mask)
         self.get_figure_settings().set_limits(Graphs.Limits.new(state[1]))
         self.props.can_redo = self._history_pos < -1
@@ -324,6 +412,7 @@ class Data(Graphs.Data):
         # Set clipboard
         self._set_data_copy()
         self._history_states = project_dict["history-states"]
+        _history_to_columns(self._history_states)
         self._history_pos = project_dict["history-position"]
         view_states = project_dict["view-history-states"]
         limits = list(map(Graphs.Limits.new, view_states))
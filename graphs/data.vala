@@ -36,15 +36,17 @@ namespace Graphs {
         private bool[] _used_positions;
         private Item[] _items = new Item[8];
         private int _n_items = 0;
-        private string[] _used_colors;
-        private string[] _used_errbar_colors;
+        // Position of every managed item, kept in sync with _items
+        private HashTable<Item, uint> _indices = new HashTable<Item, uint> (direct_hash, direct_equal);
         private Settings _settings;
-        private bool _notify_selection_changed = true;
+        // Positions changed by the bulk selection change in progress
+        private Gtk.Bitset? _selection_changes = null;
         private Limits[] _view_history_states = new Limits[HISTORY_SIZE];
         private int _current_view_history_state = 0;
         private int _oldest_view_history_state = 0;
         private int _newest_view_history_state = 0;
         private StyleParameters old_selected_style_params;
+        private HashTable<EquationItem, EquationRange> _equation_ranges = new HashTable<EquationItem, EquationRange> (direct_hash, direct_equal);
 
         public signal void style_changed ();
         protected signal string load_request (File file, ProjectParseFlags parse_flags);
@@ -55,6 +57,7 @@ namespace Graphs {
         protected signal void item_changed (Item item, string prop_name);
         protected signal void item_added (Item item);
         protected signal void item_removed (Item item, uint index);
+        protected signal void items_selected (Gtk.Bitset changed, Gtk.Bitset selected);
         protected signal void figure_settings_changed (string prop);
 
         construct {
@@ -134,9 +137,34 @@ namespace Graphs {
         // Section SelectionModel
         // All required methods to implement the SelectionModel interface
 
+        /**
+         * Start changing the selection of many items at once.
+         *
+         * Until end_selection_change, per item selection changes neither
+         * emit selection-changed nor item-changed. The changed positions are
+         * collected and reported once instead.
+         */
+        private void begin_selection_change () {
+            _selection_changes = new Gtk.Bitset.empty ();
+        }
+
+        private void end_selection_change (uint position, uint n_items) {
+            Gtk.Bitset changes = (owned) _selection_changes;
+            if (changes.is_empty ()) return;
+            items_selected.emit (changes, get_selection_in_range (0, _n_items));
+            selection_changed.emit (position, n_items);
+        }
+
+        private void set_item_selected (uint position, bool selected) {
+            Item item = _items[position];
+            if (item.selected == selected) return;
+            _selection_changes.add (position);
+            item.selected = selected;
+        }
+
         private void clear_selection () {
             for (uint index = 0; index < _n_items; index++) {
-                _items[index].selected = false;
+                set_item_selected (index, false);
             }
         }
 
@@ -153,22 +181,20 @@ namespace Graphs {
         }
 
         public bool select_all () {
-            _notify_selection_changed = false;
+            begin_selection_change ();
             for (uint index = 0; index < _n_items; index++) {
-                _items[index].selected = true;
+                set_item_selected (index, true);
             }
-            _notify_selection_changed = true;
-            selection_changed.emit (0, _n_items);
+            end_selection_change (0, _n_items);
             return true;
         }
 
         public bool select_item (uint position, bool unselect_rest) {
             if (unselect_rest) {
-                _notify_selection_changed = false;
+                begin_selection_change ();
                 clear_selection ();
-                _items[position].selected = true;
-                _notify_selection_changed = true;
-                selection_changed.emit (0, _n_items);
+                set_item_selected (position, true);
+                end_selection_change (0, _n_items);
             } else {
                 _items[position].selected = true;
             }
@@ -176,40 +202,34 @@ namespace Graphs {
         }
 
         public bool select_range (uint position, uint n_items, bool unselect_rest) {
-            _notify_selection_changed = false;
+            begin_selection_change ();
+            if (unselect_rest) clear_selection ();
+            for (uint index = position; index < position + n_items; index++) {
+                set_item_selected (index, true);
+            }
             if (unselect_rest) {
-                clear_selection ();
-                for (uint index = position; index < position + n_items; index++) {
-                    _items[index].selected = true;
-                }
-                selection_changed.emit (0, _n_items);
+                end_selection_change (0, _n_items);
             } else {
-                for (uint index = position; index < position + n_items; index++) {
-                     _items[index].selected = true;
-                }
-                selection_changed.emit (position, n_items);
+                end_selection_change (position, n_items);
             }
-            _notify_selection_changed = true;
             return true;
         }
 
         public bool set_selection (Gtk.Bitset selection, Gtk.Bitset mask) {
             if (mask.is_empty ()) return true;
-            _notify_selection_changed = false;
+            begin_selection_change ();
             for (int index = 0; index < _n_items; index++) {
                 if (!mask.contains (index)) continue;
-                _items[index].selected = selection.contains (index);
+                set_item_selected (index, selection.contains (index));
             }
-            _notify_selection_changed = true;
-            selection_changed.emit (0, _n_items);
+            end_selection_change (0, _n_items);
             return true;
         }
 
         public bool unselect_all () {
-            _notify_selection_changed = false;
+            begin_selection_change ();
             clear_selection ();
-            _notify_selection_changed = true;
-            selection_changed.emit (0, _n_items);
+            end_selection_change (0, _n_items);
             return true;
         }
 
@@ -219,12 +239,11 @@ namespace Graphs {
         }
 
         public bool unselect_range (uint position, uint n_items) {
-            _notify_selection_changed = false;
+            begin_selection_change ();
             for (uint index = position; index < position + n_items; index++) {
-                _items[index].selected = false;
+                set_item_selected (index, false);
             }
-            _notify_selection_changed = true;
-            selection_changed.emit (position, n_items);
+            end_selection_change (position, n_items);
             return true;
         }
 
@@ -237,6 +256,7 @@ namespace Graphs {
             for (int index = 0; index < n_items; index++) {
                 _items[index] = null;
             }
+            _indices.remove_all ();
             _n_items = 0;
             items_changed.emit (0, n_items, 0);
             this.can_undo = false;
@@ -262,6 +282,15 @@ namespace Graphs {
             }
         }
 
+        /**
+         * Update the stored positions of the items from position onwards.
+         */
+        private void update_indices (uint position) {
+            for (uint index = position; index < _n_items; index++) {
+                _indices[_items[index]] = index;
+            }
+        }
+
         private void _update_used_positions () {
             if (_n_items == 0) {
                 _used_positions = {true, false, true, false};
@@ -280,7 +309,7 @@ namespace Graphs {
 
         private void _connect_to_item (Item item) {
             item.notify["selected"].connect (() => {
-                if (_notify_selection_changed) selection_changed.emit (index (item), 1);
+                if (_selection_changes == null) selection_changed.emit (index (item), 1);
             });
             item.notify.connect (_on_item_change);
             item.notify["xposition"].connect (_on_item_position_change);
@@ -291,6 +320,7 @@ namespace Graphs {
             _connect_to_item (item);
             grow_if_needed (1);
             _items[_n_items] = item;
+            _indices[item] = _n_items;
             items_changed.emit (_n_items++, 0, 1);
         }
 
@@ -300,13 +330,16 @@ namespace Graphs {
             _items.move (index, index + 1, _n_items - index);
             _items[index] = item;
             _n_items++;
+            update_indices (index);
             items_changed.emit (index, 0, 1);
         }
 
         protected void _remove_item (uint index) {
+            _indices.remove (_items[index]);
             _items[index] = null;
             _items.move ((int) index + 1, (int) index, (int) (_n_items - index - 1));
             _n_items--;
+            update_indices (index);
             items_changed.emit (index, 1, 0);
         }
 
@@ -316,18 +349,24 @@ namespace Graphs {
             return (figure_settings_value == _settings.get_string (prop));
         }
 
-        private void append_used_color (string color) {
-            if (color in _used_colors) return;
-            if (!(color in selected_style_params.color_cycle)) return;
-            _used_colors += color;
-            if (_used_colors.length == selected_style_params.color_cycle.length) _used_colors = {};
+        /**
+         * Mark a color of a cycle as used.
+         *
+         * Once every color of the cycle is used, all colors are free again.
+         */
+        private static void append_used_color (Gee.Set<string> used, Gee.Set<string> cycle, string color) {
+            if (!cycle.contains (color) || !used.add (color)) return;
+            if (used.size == cycle.size) used.clear ();
         }
 
-        private void append_used_errbar_color (string color) {
-            if (color in _used_errbar_colors) return;
-            if (!(color in selected_style_params.errorbar_cycle)) return;
-            _used_errbar_colors += color;
-            if (_used_errbar_colors.length == selected_style_params.errorbar_cycle.length) _used_errbar_colors = {};
+        /**
+         * Get the first color of a cycle that is not used yet.
+         */
+        private static string? get_unused_color (Gee.Set<string> used, string[] cycle) {
+            foreach (unowned string color in cycle) {
+                if (!used.contains (color)) return color;
+            }
+            return null;
         }
 
         /**
@@ -339,39 +378,37 @@ namespace Graphs {
          * match the items label, they get moved to another axis.
          */
         public void add_items (Item[] items) {
-            _used_colors = {};
-            _used_errbar_colors = {};
+            var color_cycle = new Gee.HashSet<string> ();
+            color_cycle.add_all_array (selected_style_params.color_cycle);
+            var errorbar_cycle = new Gee.HashSet<string> ();
+            errorbar_cycle.add_all_array (selected_style_params.errorbar_cycle);
+            var used_colors = new Gee.HashSet<string> ();
+            var used_errbar_colors = new Gee.HashSet<string> ();
             foreach (Item item in this) {
-                if (item.color in selected_style_params.color_cycle) append_used_color (item.color);
+                append_used_color (used_colors, color_cycle, item.color);
                 if (item is DataItem) {
-                    unowned string errcolor = ((DataItem) item).errcolor;
-                    if (errcolor in selected_style_params.errorbar_cycle) append_used_errbar_color (errcolor);
+                    append_used_color (used_errbar_colors, errorbar_cycle, ((DataItem) item).errcolor);
                 }
             }
-            string[] used_names = get_names ();
+            var used_names = new UniqueStrings (get_names ());
             uint prev_size = _n_items;
             grow_if_needed (items.length);
             foreach (Item item in items) {
-                item.name = Tools.get_duplicate_string (item.name, used_names);
-                used_names += item.name;
+                item.name = used_names.add (item.name);
                 if (item.color == "") {
-                    foreach (unowned string color in selected_style_params.color_cycle) {
-                        if (!(color in _used_colors)) {
-                            append_used_color (color);
-                            item.color = color;
-                            break;
-                        }
+                    string? color = get_unused_color (used_colors, selected_style_params.color_cycle);
+                    if (color != null) {
+                        append_used_color (used_colors, color_cycle, color);
+                        item.color = color;
                     }
                 }
                 if (item is DataItem) {
                     unowned string errcolor = ((DataItem) item).errcolor;
                     if (errcolor == "") {
-                        foreach (unowned string color in selected_style_params.errorbar_cycle) {
-                            if (!(color in _used_errbar_colors)) {
-                                append_used_errbar_color (color);
-                                item.set ("errcolor", color);
-                                break;
-                            }
+                        string? color = get_unused_color (used_errbar_colors, selected_style_params.errorbar_cycle);
+                        if (color != null) {
+                            append_used_color (used_errbar_colors, errorbar_cycle, color);
+                            item.set ("errcolor", color);
                         }
                     }
                 }
@@ -410,6 +447,7 @@ namespace Graphs {
                     }
                 }
                 _connect_to_item (item);
+                _indices[item] = _n_items;
                 _items[_n_items++] = item;
                 item_added.emit (item);
             }
@@ -425,6 +463,8 @@ namespace Graphs {
             }
             _n_items = items.length;
             _items = (owned) items;
+            _indices.remove_all ();
+            update_indices (0);
             _update_used_positions ();
             items_changed.emit (0, removed, _n_items);
         }
@@ -554,10 +594,8 @@ namespace Graphs {
         }
 
         public uint index (Item item) {
-            for (uint index = 0; index < _n_items; index++) {
-                if (_items[index] == item) return index;
-            }
-            assert_not_reached ();
+            assert (_indices.contains (item));
+            return _indices[item];
         }
 
         public unowned bool[] get_used_positions () {
@@ -575,6 +613,9 @@ namespace Graphs {
             _items[index1] = item;
             uint position = uint.min (index1, index2);
             uint changed = uint.max (index1, index2) - position + 1;
+            for (uint index = position; index < position + changed; index++) {
+                _indices[_items[index]] = index;
+            }
             items_changed.emit (position, changed, changed);
             position_changed.emit (index1, index2);
         }
@@ -602,6 +643,18 @@ namespace Graphs {
 
                 if (!CUtilities.array_minmax (data, scale.is_nonzero (), out min_value, out max_value)) return;
 
+                update_range (min_value, max_value);
+            }
+
+            public void update_column (DataHolder holder, int column) {
+                double min_value, max_value;
+
+                if (!holder.get_range (column, scale.is_nonzero (), out min_value, out max_value)) return;
+
+                update_range (min_value, max_value);
+            }
+
+            public void update_range (double min_value, double max_value) {
                 if (used) {
                     this.min_value = double.min (this.min_value, min_value);
                     this.max_value = double.max (this.max_value, max_value);
@@ -622,6 +675,46 @@ namespace Graphs {
             }
         }
 
+        /**
+         * Y-range of an equation over the x-range of an axis.
+         *
+         * Kept between calls of optimize_limits, so unchanged equations
+         * over an unchanged x-range are neither checked for singularities
+         * nor evaluated again. Singularities are looked up in the shared
+         * cache of the Python side.
+         */
+        private class EquationRange {
+            public Program program;
+            public unowned string xdirection;
+            public double xmin;
+            public double xmax;
+            public Scale xscale;
+            public bool ignore_zero;
+            public bool singular;
+            public bool valid = false;
+            public double min_value;
+            public double max_value;
+
+            public EquationRange (Ast equation, Program program, AxisInfo xaxis, bool ignore_zero) {
+                this.program = program;
+                this.xdirection = xaxis.direction;
+                this.xmin = xaxis.min_value;
+                this.xmax = xaxis.max_value;
+                this.xscale = xaxis.scale;
+                this.ignore_zero = ignore_zero;
+                this.singular = PythonHelper.has_singularities (equation, program, xmin, xmax, xscale);
+            }
+
+            public bool matches (Program program, AxisInfo xaxis, bool ignore_zero) {
+                return this.program == program
+                    && xdirection == xaxis.direction
+                    && xmin == xaxis.min_value
+                    && xmax == xaxis.max_value
+                    && xscale == xaxis.scale
+                    && this.ignore_zero == ignore_zero;
+            }
+        }
+
         public void optimize_limits () {
             var figure_settings = this.figure_settings;
             bool hide_unselected = figure_settings.hide_unselected;
@@ -644,26 +737,60 @@ namespace Graphs {
                 }
 
                 if (!(item is DataItem)) continue;
-                var data_item = (DataItem) item;
+                DataHolder holder = ((DataItem) item).data;
 
                 int xindex = item.xposition * 2;
                 int yindex = item.yposition * 2 + 1;
 
-                axes[xindex].update_min_max (data_item.get_xdata ());
-                axes[yindex].update_min_max (data_item.get_ydata ());
+                axes[xindex].update_column (holder, 0);
+                axes[yindex].update_column (holder, 1);
             }
 
+            var ranges = new HashTable<EquationItem, EquationRange> (direct_hash, direct_equal);
+            var misses = new Gee.ArrayList<EquationRange> ();
             foreach (EquationItem item in equation_items) {
-                int xindex = item.xposition * 2;
-                int yindex = item.yposition * 2 + 1;
+                unowned AxisInfo xaxis = axes[item.xposition * 2];
+                bool ignore_zero = axes[item.yposition * 2 + 1].scale.is_nonzero ();
 
-                if (PythonHelper.has_singularities (item.equation, axes[xindex].min_value, axes[xindex].max_value)) continue;
+                EquationRange? range = _equation_ranges.lookup (item);
+                if (range == null || !range.matches (item.get_program (), xaxis, ignore_zero)) {
+                    range = new EquationRange (item.equation, item.get_program (), xaxis, ignore_zero);
+                    if (!range.singular) misses.add (range);
+                }
+                ranges.insert (item, range);
+            }
 
-                unowned double[] xdata = axes[xindex].get_xdata ();
-                double[] ydata = item.get_program ().eval (xdata);
+            // Evaluate the new ranges of each x-axis in a single pass
+            for (int xindex = 0; xindex < axes.length; xindex += 2) {
+                EquationRange[] batch = {};
+                foreach (EquationRange range in misses) {
+                    if (range.xdirection == axes[xindex].direction) batch += range;
+                }
+                if (batch.length == 0) continue;
+
+                var programs = new Program[batch.length];
+                var ignore_zero = new bool[batch.length];
+                var min = new double[batch.length];
+                var max = new double[batch.length];
+                var valid = new bool[batch.length];
+                for (int i = 0; i < batch.length; i++) {
+                    programs[i] = batch[i].program;
+                    ignore_zero[i] = batch[i].ignore_zero;
+                }
+                Program.eval_ranges (programs, axes[xindex].get_xdata (), ignore_zero, min, max, valid);
+                for (int i = 0; i < batch.length; i++) {
+                    batch[i].valid = valid[i];
+                    batch[i].min_value = min[i];
+                    batch[i].max_value = max[i];
+                }
+            }
 
-                axes[yindex].update_min_max (ydata);
+            foreach (EquationItem item in equation_items) {
+                EquationRange range = ranges.lookup (item);
+                if (range.singular || !range.valid) continue;
+                axes[item.yposition * 2 + 1].update_range (range.min_value, range.max_value);
             }
+            _equation_ranges = ranges;
 
             for (int i = 0; i < axes.length; i++) {
                 unowned AxisInfo axis = axes[i];
@@ -828,6 +955,8 @@ namespace Graphs {
         // Section listeners
 
         private void _on_item_change (Object item, ParamSpec spec) {
+            // Bulk selection changes are reported through items_selected
+            if (_selection_changes != null && spec.name == "selected") return;
             item_changed.emit ((Item) item, spec.name);
         }
 
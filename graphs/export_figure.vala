@@ -12,6 +12,12 @@ namespace Graphs {
         [GtkChild]
         private unowned Adw.ComboRow file_format { get; }
 
+        [GtkChild]
+        private unowned Adw.ComboRow rasterize_data { get; }
+
+        [GtkChild]
+        private unowned Adw.SpinRow raster_dpi { get; }
+
         [GtkChild]
         private unowned Adw.SpinRow width { get; }
 
@@ -28,6 +34,8 @@ namespace Graphs {
 
             file_format.set_selected (settings.get_enum ("file-format"));
             transparent.set_active (settings.get_boolean ("transparent"));
+            rasterize_data.set_selected (settings.get_enum ("rasterize-data"));
+            raster_dpi.set_value (settings.get_int ("raster-dpi"));
             width.set_value (settings.get_int ("width"));
             height.set_value (settings.get_int ("height"));
 
@@ -63,6 +71,8 @@ namespace Graphs {
 
                     settings.set_string ("file-format", suffix);
                     settings.set_boolean ("transparent", transparent.get_active ());
+                    settings.set_enum ("rasterize-data", (int) rasterize_data.get_selected ());
+                    settings.set_int ("raster-dpi", (int) raster_dpi.get_value ());
                     settings.set_int ("width", (int) width.get_value ());
                     settings.set_int ("height", (int) height.get_value ());
 
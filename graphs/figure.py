@@ -7,11 +7,48 @@ Acts as an interface between matplotlib and GObject.
 import contextlib
 import logging
 
-from gi.repository import GObject, Gio, Graphs, Gtk
+from gi.repository import GLib, GObject, Gio, Graphs, Gtk
 
 from graphs import artist, misc
 
 from matplotlib import figure, pyplot
+from matplotlib.collections import LineCollection
+from matplotlib.layout_engine import TightLayoutEngine
+from matplotlib.lines import Line2D
+
+
+# Axes sharing the limits of each direction and the limit they share
+_LIMIT_AXES = {
+    "bottom": (("axis", "right_axis"), "x"),
+    "left": (("axis", "top_left_axis"), "y"),
+    "top": (("top_left_axis", "top_right_axis"), "x"),
+    "right": (("right_axis", "top_right_axis"), "y"),
+}
+
+# Style parameters changing the size of the text around the axes
+_LAYOUT_PARAMS = (
+    "font.family",
+    "font.size",
+    "axes.labelsize",
+    "axes.labelpad",
+    "axes.titlesize",
+    "axes.titlepad",
+    "legend.fontsize",
+    "xtick.labelsize",
+    "ytick.labelsize",
+    "xtick.labelbottom",
+    "xtick.labeltop",
+    "ytick.labelleft",
+    "ytick.labelright",
+    "xtick.major.size",
+    "ytick.major.size",
+    "xtick.major.pad",
+    "ytick.major.pad",
+)
+
+# Spread of the zorder offsets keeping the item order. Kept below one so
+# artists of different kinds stay in their default layers.
+_DRAW_ORDER_SPAN = 0.5
 
 
 def _ellipsize(text: str, max_chars: int) -> str:
@@ -19,6 +56,63 @@ def _ellipsize(text: str, max_chars: int) -> str:
     return (text[:max_chars] + "…") if len(text) > max_chars else text
 
 
+def count_vertices(data_artists: dict) -> int:
+    """Count the vertices of all data artists."""
+    count = 0
+    for artists in data_artists.values():
+        for handle in artists:
+            if not handle.get_visible():
+                continue
+            if isinstance(handle, Line2D):
+                count += len(handle.get_xdata())
+            elif isinstance(handle, LineCollection):
+                count += 2 * len(handle.get_paths())
+            else:
+                count += sum(len(path) for path in handle.get_paths())
+    return count
+
+
+class _CachedTightLayoutEngine(TightLayoutEngine):
+    """
+    Tight layout engine that only solves the layout when it may change.
+
+    The layout is reused while the figure size, the style, the scales and
+    the limits stay the same. Changes to labels, legends and axis visibility
+    are signalled with `invalidate`. While frozen the previous layout is
+    always reused.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._key = None
+        self.frozen = False
+        self.style_key = ()
+
+    def invalidate(self) -> None:
+        """Solve the layout again on the next draw."""
+        self._key = None
+
+    def execute(self, fig: figure.Figure) -> None:
+        """Solve the tight layout if anything affecting it changed."""
+        if self.frozen and self._key is not None:
+            return
+        key = self._get_key(fig)
+        if key == self._key:
+            return
+        super().execute(fig)
+        self._key = key
+
+    def _get_key(self, fig: figure.Figure) -> tuple:
+        key = [tuple(fig.bbox.size), fig.dpi, self.style_key]
+        for axis in fig.axes:
+            key.extend((
+                tuple(axis.viewLim.bounds),
+                axis.get_xscale(),
+                axis.get_yscale(),
+            ))
+        return tuple(key)
+
+
 class Figure(GObject.Object, figure.Figure):
     """Custom Figure."""
 
@@ -36,7 +130,10 @@ class Figure(GObject.Object, figure.Figure):
         self._items = items
         self.parent = parent
         pyplot.rcParams.update(self._style_params.style_params)
-        figure.Figure.__init__(self, tight_layout=True)
+        figure.Figure.__init__(self, layout=_CachedTightLayoutEngine())
+        self.get_layout_engine().style_key = tuple(
+            str(pyplot.rcParams[key]) for key in _LAYOUT_PARAMS
+        )
 
         self.axis = self.add_subplot(111)
         self.top_left_axis = self.axis.twiny()
@@ -44,6 +141,11 @@ class Figure(GObject.Object, figure.Figure):
         self.top_right_axis = self.top_left_axis.twinx()
         self._legend_axis = self.axis
         self._artists = []
+        self._wrappers = {}
+        self._pending_limits = {}
+        self._artists_dirty = False
+        self._legend_dirty = False
+        self._flush_id = 0
 
         if figure_settings is not None:
             bottom_scale = \
@@ -102,27 +204,95 @@ class Figure(GObject.Object, figure.Figure):
             self._legend = True
             self._legend_position = "best"
 
-        self._item_handlers = [items.connect("items-changed", self._redraw)]
+        self._item_handlers = [
+            items.connect("items-changed", self._queue_redraw),
+        ]
         if isinstance(items, Gtk.SelectionModel):
             self._item_handlers.append(
-                items.connect("selection-changed", self._redraw),
+                items.connect("selection-changed", self._queue_redraw),
             )
-        self._redraw()
+        self._artists_dirty = True
+        self.flush_pending()
 
     def _drop_artists(self) -> None:
         """Release the current artist wrappers and their subscriptions."""
         for handle in self._artists:
-            with contextlib.suppress(AttributeError):
-                handle.disconnect_item()
+            handle.release()
         self._artists = []
+        self._wrappers = {}
 
     def detach(self) -> None:
         """Stop tracking the data model before the canvas is replaced."""
         for handler in self._item_handlers:
             self._items.disconnect(handler)
         self._item_handlers = []
+        if self._flush_id:
+            GLib.source_remove(self._flush_id)
+            self._flush_id = 0
         self._drop_artists()
 
+    def _queue_flush(self) -> None:
+        """Apply pending changes once before the next paint."""
+        if not self._flush_id:
+            self._flush_id = GLib.idle_add(
+                self._on_flush,
+                priority=GLib.PRIORITY_HIGH_IDLE,
+            )
+
+    def _on_flush(self) -> bool:
+        self._flush_id = 0
+        if self.flush_pending():
+            self.queue_draw()
+        return False
+
+    def flush_pending(self) -> bool:
+        """
+        Apply all pending limit, artist and legend changes.
+
+        Returns whether anything changed. No draw is queued, as callers
+        flush right before drawing or reading the figure.
+        """
+        if self._flush_id:
+            GLib.source_remove(self._flush_id)
+            self._flush_id = 0
+        if not (self._pending_limits or self._artists_dirty
+                or self._legend_dirty):
+            return False
+
+        self._invalidate_layout()
+        limits, self._pending_limits = self._pending_limits, {}
+        for direction, (lower, upper) in limits.items():
+            names, dimension = _LIMIT_AXES[direction]
+            for name in names:
+                axis = getattr(self, name)
+                getattr(axis, f"set_{dimension}lim")(lower, upper)
+
+        if self._artists_dirty:
+            self._artists_dirty = False
+            self._redraw()
+        if self._legend_dirty:
+            self._legend_dirty = False
+            self._build_legend()
+        return True
+
+    def draw(self, renderer) -> None:
+        """Apply pending changes before drawing."""
+        self.flush_pending()
+        figure.Figure.draw(self, renderer)
+
+    def freeze_layout(self, frozen: bool) -> None:
+        """Reuse the current layout while frozen, e.g. during gestures."""
+        self.get_layout_engine().frozen = frozen
+
+    def _invalidate_layout(self) -> None:
+        """Solve the layout again on the next draw."""
+        self.get_layout_engine().invalidate()
+
+    def _queue_redraw(self, *_args) -> None:
+        self._artists_dirty = True
+        self._legend_dirty = True
+        self._queue_flush()
+
     def _redraw(self, *_args) -> None:
         logging.debug("redrawing figure")
         # bottom, top, left, right
@@ -175,8 +345,6 @@ class Figure(GObject.Object, figure.Figure):
 
                 axis.tick_params(which=ticks, **tick_params)
 
-            for handle in [*axis.collections, *axis.lines, *axis.texts]:
-                handle.remove()
             axis_legend = axis.get_legend()
             if axis_legend is not None:
                 axis_legend.remove()
@@ -192,14 +360,53 @@ class Figure(GObject.Object, figure.Figure):
         self.axis.get_yaxis().set_visible(visible_axes[2])
         self.right_axis.get_yaxis().set_visible(visible_axes[3])
 
-        self._drop_artists()
-        self._artists = [
-            artist.new_for_item(self, item)
-            for item in reversed(drawable_items)
-        ]
-        self.update_legend()
+        self._reconcile_artists(drawable_items)
+        self._legend_dirty = True
+
+    def _reconcile_artists(self, drawable_items: list) -> None:
+        """
+        Match the artist wrappers to the drawable items.
+
+        Wrappers are reused for items that are still drawn on the same axis,
+        so only added, removed or moved items create or drop artists. The
+        item order is kept through a small zorder offset per item.
+        """
+        previous = self._wrappers
+        self._wrappers = {}
+        self._artists = []
+        n_items = len(drawable_items)
+        for rank, item in enumerate(reversed(drawable_items)):
+            wrapper = previous.pop(item, None)
+            axis = self.axes[item.get_yposition() * 2 + item.get_xposition()]
+            if wrapper is not None and wrapper.axis is not axis:
+                wrapper.remove()
+                wrapper = None
+            if wrapper is None:
+                wrapper = artist.new_for_item(self, item)
+            wrapper.set_draw_order(rank / n_items * _DRAW_ORDER_SPAN)
+            self._wrappers[item] = wrapper
+            self._artists.append(wrapper)
+
+        for wrapper in previous.values():
+            wrapper.remove()
+
+    def get_data_artists(self) -> dict:
+        """Get the artists of all data-like items grouped by axis."""
+        data_artists = {}
+        for wrapper in self._artists:
+            if isinstance(wrapper, artist.TextItemArtistWrapper):
+                continue
+            data_artists.setdefault(wrapper.axis, []).extend(
+                wrapper.get_artists(),
+            )
+        return data_artists
 
     def update_legend(self, *_args) -> None:
+        """Queue updating the legend before the next paint."""
+        self._legend_dirty = True
+        self._queue_flush()
+
+    def _build_legend(self) -> None:
         """Update the legend or hide if not used."""
         if self._legend and self._artists:
             handles = [
@@ -244,7 +451,7 @@ class Figure(GObject.Object, figure.Figure):
     @hide_unselected.setter
     def hide_unselected(self, hide_unselected: bool) -> None:
         self._hide_unselected = hide_unselected
-        self._redraw()
+        self._queue_redraw()
 
     @GObject.Property(type=bool, default=True)
     def legend(self) -> bool:
@@ -279,6 +486,7 @@ class Figure(GObject.Object, figure.Figure):
     @title.setter
     def title(self, title: str) -> None:
         self.axis.set_title(title, picker=True).id = "title"
+        self._invalidate_layout()
         self.queue_draw()
 
     @GObject.Property(type=str)
@@ -289,6 +497,7 @@ class Figure(GObject.Object, figure.Figure):
     @bottom_label.setter
     def bottom_label(self, label: str) -> None:
         self.axis.set_xlabel(label, picker=True).id = "bottom_label"
+        self._invalidate_layout()
         self.queue_draw()
 
     @GObject.Property(type=str)
@@ -299,6 +508,7 @@ class Figure(GObject.Object, figure.Figure):
     @left_label.setter
     def left_label(self, label: str) -> None:
         self.axis.set_ylabel(label, picker=True).id = "left_label"
+        self._invalidate_layout()
         self.queue_draw()
 
     @GObject.Property(type=str)
@@ -309,6 +519,7 @@ class Figure(GObject.Object, figure.Figure):
     @top_label.setter
     def top_label(self, label: str) -> None:
         self.top_left_axis.set_xlabel(label, picker=True).id = "top_label"
+        self._invalidate_layout()
         self.queue_draw()
 
     @GObject.Property(type=str)
@@ -319,6 +530,7 @@ class Figure(GObject.Object, figure.Figure):
     @right_label.setter
     def right_label(self, label: str) -> None:
         self.right_axis.set_ylabel(label, picker=True).id = "right_label"
+        self._invalidate_layout()
         self.queue_draw()
 
     @GObject.Property(type=int)
@@ -332,6 +544,7 @@ class Figure(GObject.Object, figure.Figure):
         for axis in (self.axis, self.right_axis):
             axis.set_xscale(scale)
             axis.set_xlim(None, None)
+        self._invalidate_layout()
         self.queue_draw()
 
     @GObject.Property(type=int)
@@ -345,6 +558,7 @@ class Figure(GObject.Object, figure.Figure):
         for axis in (self.axis, self.top_left_axis):
             axis.set_yscale(scale)
             axis.set_ylim(None, None)
+        self._invalidate_layout()
         self.queue_draw()
 
     @GObject.Property(type=int)
@@ -358,6 +572,7 @@ class Figure(GObject.Object, figure.Figure):
         for axis in (self.top_right_axis, self.top_left_axis):
             axis.set_xscale(scale)
             axis.set_xlim(None, None)
+        self._invalidate_layout()
         self.queue_draw()
 
     @GObject.Property(type=int)
@@ -371,92 +586,93 @@ class Figure(GObject.Object, figure.Figure):
         for axis in (self.top_right_axis, self.right_axis):
             axis.set_yscale(scale)
             axis.set_ylim(None, None)
+        self._invalidate_layout()
         self.queue_draw()
 
     @GObject.Property(type=float)
     def min_bottom(self) -> float:
         """Lower limit for the bottom axis."""
-        return self.axis.get_xlim()[0]
+        return self._get_limit("bottom", 0)
 
     @min_bottom.setter
     def min_bottom(self, value: float) -> None:
-        for axis in (self.axis, self.right_axis):
-            axis.set_xlim(value, None)
-        self.queue_draw()
+        self._set_limit("bottom", 0, value)
 
     @GObject.Property(type=float)
     def max_bottom(self) -> float:
         """Upper limit for the bottom axis."""
-        return self.axis.get_xlim()[1]
+        return self._get_limit("bottom", 1)
 
     @max_bottom.setter
     def max_bottom(self, value: float) -> None:
-        for axis in (self.axis, self.right_axis):
-            axis.set_xlim(None, value)
-        self.queue_draw()
+        self._set_limit("bottom", 1, value)
 
     @GObject.Property(type=float)
     def min_left(self) -> float:
         """Lower limit for the left axis."""
-        return self.axis.get_ylim()[0]
+        return self._get_limit("left", 0)
 
     @min_left.setter
     def min_left(self, value: float) -> None:
-        for axis in (self.axis, self.top_left_axis):
-            axis.set_ylim(value, None)
-        self.queue_draw()
+        self._set_limit("left", 0, value)
 
     @GObject.Property(type=float)
     def max_left(self) -> float:
         """Upper limit for the left axis."""
-        return self.axis.get_ylim()[1]
+        return self._get_limit("left", 1)
 
     @max_left.setter
     def max_left(self, value: float) -> None:
-        for axis in (self.axis, self.top_left_axis):
-            axis.set_ylim(None, value)
-        self.queue_draw()
+        self._set_limit("left", 1, value)
 
     @GObject.Property(type=float)
     def min_top(self) -> float:
         """Lower limit for the top axis."""
-        return self.top_left_axis.get_xlim()[0]
+        return self._get_limit("top", 0)
 
     @min_top.setter
     def min_top(self, value: float) -> None:
-        for axis in (self.top_left_axis, self.top_right_axis):
-            axis.set_xlim(value, None)
-        self.queue_draw()
+        self._set_limit("top", 0, value)
 
     @GObject.Property(type=float)
     def max_top(self) -> float:
         """Upper limit for the top axis."""
-        return self.top_left_axis.get_xlim()[1]
+        return self._get_limit("top", 1)
 
     @max_top.setter
     def max_top(self, value: float) -> None:
-        for axis in (self.top_left_axis, self.top_right_axis):
-            axis.set_xlim(None, value)
-        self.queue_draw()
+        self._set_limit("top", 1, value)
 
     @GObject.Property(type=float)
     def min_right(self) -> float:
         """Lower limit for the right axis."""
-        return self.right_axis.get_ylim()[0]
+        return self._get_limit("right", 0)
 
     @min_right.setter
     def min_right(self, value: float) -> None:
-        for axis in (self.right_axis, self.top_right_axis):
-            axis.set_ylim(value, None)
-        self.queue_draw()
+        self._set_limit("right", 0, value)
 
     @GObject.Property(type=float)
     def max_right(self) -> float:
         """Upper limit for the right axis."""
-        return self.right_axis.get_ylim()[1]
+        return self._get_limit("right", 1)
 
     @max_right.setter
     def max_right(self, value: float) -> None:
-        for axis in (self.right_axis, self.top_right_axis):
-            axis.set_ylim(None, value)
-        self.queue_draw()
+        self._set_limit("right", 1, value)
+
+    def _get_limit(self, direction: str, index: int) -> float:
+        """Get a limit, taking pending changes into account."""
+        with contextlib.suppress(KeyError):
+            value = self._pending_limits[direction][index]
+            if value is not None:
+                return value
+        names, dimension = _LIMIT_AXES[direction]
+        axis = getattr(self, names[0])
+        return getattr(axis, f"get_{dimension}lim")()[index]
+
+    def _set_limit(self, direction: str, index: int, value: float) -> None:
+        """Set a limit once the pending changes are applied."""
+        limits = self._pending_limits.setdefault(direction, [None, None])
+        limits[index] = value
+        self._queue_flush()
@@ -0,0 +1,63 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""
+Module for exporting figures.
+
+Vector exports of dense data rasterize only the data artists, so axes,
+labels and legends stay vector while the file size no longer scales with
+the number of data points.
+"""
+import io
+
+from graphs.figure import Figure, count_vertices
+
+VECTOR_FORMATS = ("pdf", "eps", "ps", "svg")
+
+# Above this number of data vertices vector exports rasterize the data
+RASTERIZE_VERTEX_THRESHOLD = 200000
+
+
+def should_rasterize(figure: Figure, fmt: str, mode: str) -> bool:
+    """
+    Check whether the data artists should be rasterized.
+
+    Mode is one of the `rasterize-data` setting values: "auto", "always" or
+    "never". Raster formats are never rasterized separately.
+    """
+    if fmt.lower() not in VECTOR_FORMATS or mode == "never":
+        return False
+    if mode == "always":
+        return True
+    count = count_vertices(figure.get_data_artists())
+    return count > RASTERIZE_VERTEX_THRESHOLD
+
+
+def export_figure(
+    figure: Figure,
+    file_like: io.IOBase,
+    fmt: str,
+    width: int,
+    height: int,
+    transparent: bool = True,
+    rasterize: str = "auto",
+    raster_dpi: int = 300,
+) -> None:
+    """Export a figure of width x height pixels to a file-like object."""
+    vector = fmt.lower() in VECTOR_FORMATS
+    dpi = 100 if vector else figure.get_dpi()
+    figure.set_size_inches(width / dpi, height / dpi)
+
+    if should_rasterize(figure, fmt, rasterize):
+        # The vector parts are laid out in points, so the dpi only sets the
+        # resolution of the rasterized artists.
+        for artists in figure.get_data_artists().values():
+            for handle in artists:
+                handle.set_rasterized(True)
+        dpi = raster_dpi
+
+    figure.savefig(
+        file_like,
+        format=fmt,
+        dpi=dpi,
+        transparent=transparent,
+        bbox_inches=None,
+    )
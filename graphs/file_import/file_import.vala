@@ -49,6 +49,34 @@ namespace Graphs {
         }
     }
 
+    /**
+     * Cache for the generated x columns of single column imports.
+     *
+     * Every distinct equation is compiled once per import and the generated
+     * column is shared between all items of equal length.
+     */
+    [Compact]
+    private class IndexColumnCache {
+        private HashTable<string, Program> programs = new HashTable<string, Program> (str_hash, str_equal);
+        private HashTable<string, Bytes> columns = new HashTable<string, Bytes> (str_hash, str_equal);
+
+        public Bytes get_column (string equation, int length) throws MathError {
+            string key = "%d:%s".printf (length, equation);
+            Bytes? column = columns.get (key);
+            if (column != null) return column;
+
+            unowned Program? program = programs.get (equation);
+            if (program == null) {
+                programs.insert (equation, ast_to_program (expression_to_ast (equation), "n"));
+                program = programs.get (equation);
+            }
+
+            column = DataHolder.take_column (program.eval (MathTools.arange (length)));
+            columns.insert (key, column);
+            return column;
+        }
+    }
+
     private const string[] ASCII_SUFFIXES = {"xy", "dat", "txt", "csv"};
 
     public class DataImporter : Object {
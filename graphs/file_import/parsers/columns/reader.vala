@@ -156,6 +156,7 @@ namespace Graphs {
 
         public ItemList add_items (StyleParameters style) throws ParseError {
             var itemlist = new ItemList ();
+            var index_columns = new IndexColumnCache ();
 
             foreach (var item_settings in items) {
                 uint yrank = get_rank (item_settings.column_y);
@@ -166,22 +167,23 @@ namespace Graphs {
                 double[]? yerr = item_settings.use_yerr ? columns[get_rank (item_settings.yerr_index)].get_data () : null;
 
                 string xlabel;
-                double[] xdata;
+                DataHolder holder;
                 if (item_settings.single_column) {
                     xlabel = "";
                     try {
-                        Ast equation = expression_to_ast (item_settings.equation);
-                        xdata = MathTools.evaluate_expression (equation, ydata.length, "n");
+                        Bytes xdata = index_columns.get_column (item_settings.equation, ydata.length);
+                        holder = new DataHolder.compact_with_xdata (xdata, (owned) ydata, (owned) xerr, (owned) yerr);
                     } catch (MathError e) {
                         throw new ParseError.INVALID (e.message);
                     }
                 } else {
                     uint xrank = get_rank (item_settings.column_x);
                     xlabel = (owned) columns[xrank].header;
-                    xdata = columns[xrank].get_data ();
+                    double[] xdata = columns[xrank].get_data ();
+                    holder = new DataHolder.compact ((owned) xdata, (owned) ydata, (owned) xerr, (owned) yerr);
                 }
 
-                Item item = ItemFactory.new_data_item (style, (owned) xdata, (owned) ydata, (owned) xerr, (owned) yerr);
+                Item item = ItemFactory.new_data_item_with_holder (style, holder);
                 item.xlabel = xlabel;
                 item.ylabel = ylabel;
                 item.name = settings.filename;
@@ -422,6 +422,7 @@ namespace Graphs {
             parser.parse (settings.get_int ("sheet-index"), n_used_indices, columns);
 
             var itemlist = new ItemList ();
+            var index_columns = new IndexColumnCache ();
 
             iter = items.iterator ();
             for (int i = 0; i < iter.n_children (); i++) {
@@ -434,21 +435,22 @@ namespace Graphs {
                 double[]? yerr = item_settings.use_yerr ? columns[item_settings.yerr_index].get_data () : null;
 
                 unowned string xlabel;
-                double[] xdata;
+                DataHolder holder;
                 if (item_settings.single_column) {
                     xlabel = "";
                     try {
-                        Ast equation = expression_to_ast (item_settings.equation);
-                        xdata = MathTools.evaluate_expression (equation, ydata.length, "n");
+                        Bytes xdata = index_columns.get_column (item_settings.equation, ydata.length);
+                        holder = new DataHolder.compact_with_xdata (xdata, (owned) ydata, (owned) xerr, (owned) yerr);
                     } catch (MathError e) {
                         throw new ParseError.PARSE_ERROR (e.message);
                     }
                 } else {
                     xlabel = columns[item_settings.column_x].header;
-                    xdata = columns[item_settings.column_x].get_data ();
+                    double[] xdata = columns[item_settings.column_x].get_data ();
+                    holder = new DataHolder.compact ((owned) xdata, (owned) ydata, (owned) xerr, (owned) yerr);
                 }
 
-                Item item = ItemFactory.new_data_item (style, (owned) xdata, (owned) ydata, (owned) xerr, (owned) yerr);
+                Item item = ItemFactory.new_data_item_with_holder (style, holder);
                 item.xlabel = xlabel;
                 item.ylabel = ylabel;
                 item.name = settings.filename;
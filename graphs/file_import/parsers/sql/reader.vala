@@ -149,7 +149,8 @@ namespace Graphs {
                 yerr = get_column_data (table_name, settings.get_string ("yerr-column"));
 
             ItemList items = new ItemList ();
-            DataItem item = ItemFactory.new_data_item (style, (owned) xdata, (owned) ydata, (owned) xerr, (owned) yerr);
+            var holder = new DataHolder.compact ((owned) xdata, (owned) ydata, (owned) xerr, (owned) yerr);
+            DataItem item = ItemFactory.new_data_item_with_holder (style, holder);
             item.xlabel = x_column;
             item.ylabel = y_column;
             item.name = x_column + " vs " + y_column;
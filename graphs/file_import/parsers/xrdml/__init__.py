@@ -8,6 +8,7 @@ from gi.repository import Graphs
 
 import gio_pyio
 
+from graphs import utilities
 from graphs.file_import import Parser
 from graphs.item import DataItem
 
@@ -62,8 +63,8 @@ class XrdmlParser(Parser):
         items.add(
             DataItem.new(
                 style,
-                xdata,
-                ydata,
+                utilities.compact_column(xdata),
+                utilities.compact_column(ydata),
                 name=settings.get_filename(),
                 xlabel=f"{scan_axis} ({unit})",
                 ylabel=_("Intensity (cps)"),
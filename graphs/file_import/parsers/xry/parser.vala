@@ -78,7 +78,8 @@ namespace Graphs {
 
                     double[] item_xdata = xdata[column.first_val:column.last_val + 1];
                     double[] ydata = column.data[column.first_val:column.last_val + 1];
-                    DataItem item = ItemFactory.new_data_item (style, (owned) item_xdata, (owned) ydata);
+                    var holder = new DataHolder.compact ((owned) item_xdata, (owned) ydata, null, null);
+                    DataItem item = ItemFactory.new_data_item_with_holder (style, holder);
                     item.name = name;
                     item.xlabel = _("β (°)");
                     item.ylabel = _("R (1/s)");
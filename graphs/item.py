@@ -93,7 +93,7 @@ class DataItem(Graphs.DataItem, _PythonItemMixin):
         **kwargs,
     ):
         """Create new DataItem."""
-        data = Graphs.DataHolder.new(xdata, ydata, xerr, yerr)
+        data = utilities.new_data_holder(xdata, ydata, xerr, yerr)
         return cls.new_with_data(style, data, **kwargs)
 
     @classmethod
@@ -113,22 +113,24 @@ class DataItem(Graphs.DataItem, _PythonItemMixin):
     def to_dict(self) -> dict:
         """Convert item to dict."""
         dictionary = super().to_dict()
-        dictionary["data"] = self.get_data_tuple()
+        dictionary["data"] = list(self.get_data_tuple())
+        holder = self.props.data
+        data_types = [
+            utilities.COLUMN_DTYPES[holder.get_column_type(index)].name
+            for index in range(4)
+        ]
+        if any(data_type != "float64" for data_type in data_types):
+            dictionary["data_types"] = data_types
         return dictionary
 
-    def get_data_tuple(self) -> tuple[list, list, list, list]:
-        """Get the data as a picklable tuple."""
+    def get_data_tuple(self) -> tuple[numpy.ndarray, ...]:
+        """Get the data as a tuple of readonly arrays sharing the memory."""
         holder = self.props.data
-        return (
-            utilities.bytes_to_list(holder.get_xdata_b()),
-            utilities.bytes_to_list(holder.get_ydata_b()),
-            utilities.bytes_to_list(holder.get_xerr_b()),
-            utilities.bytes_to_list(holder.get_yerr_b()),
-        )
+        return tuple(utilities.get_column(holder, index) for index in range(4))
 
-    def set_data_tuple(self, data: tuple[list, list, list, list]) -> None:
-        """Set the data from a tuple."""
-        self.props.data = Graphs.DataHolder.new(*data)
+    def set_data_tuple(self, data: tuple) -> None:
+        """Set the data from a tuple, sharing the unchanged columns."""
+        self.props.data = utilities.new_data_holder(*data)
 
     def get_xydata(self) -> tuple[numpy.ndarray, numpy.ndarray]:
         """Get x- and y-data."""
@@ -140,19 +142,19 @@ class DataItem(Graphs.DataItem, _PythonItemMixin):
 
     def get_xdata(self) -> numpy.ndarray:
         """Get xdata."""
-        return utilities.bytes_to_ndarray(self.props.data.get_xdata_b())
+        return utilities.get_column(self.props.data, 0)
 
     def get_ydata(self) -> numpy.ndarray:
         """Get ydata."""
-        return utilities.bytes_to_ndarray(self.props.data.get_ydata_b())
+        return utilities.get_column(self.props.data, 1)
 
     def get_xerr(self) -> numpy.ndarray:
         """Get xerr."""
-        return utilities.bytes_to_ndarray(self.props.data.get_xerr_b())
+        return utilities.get_column(self.props.data, 2)
 
     def get_yerr(self) -> numpy.ndarray:
         """Get yerr."""
-        return utilities.bytes_to_ndarray(self.props.data.get_yerr_b())
+        return utilities.get_column(self.props.data, 3)
 
 
 class GeneratedDataItem(Graphs.GeneratedDataItem, DataItem):
@@ -265,7 +267,8 @@ class FillItem(Graphs.FillItem, _PythonItemMixin):
         **kwargs,
     ):
         """Create new FillItem."""
-        return cls.new_with_data(style, Graphs.FillHolder.new(*data), **kwargs)
+        holder = utilities.new_fill_holder(*data)
+        return cls.new_with_data(style, holder, **kwargs)
 
     @classmethod
     def new_with_data(
@@ -280,21 +283,21 @@ class FillItem(Graphs.FillItem, _PythonItemMixin):
     def to_dict(self) -> dict:
         """Convert item to dict."""
         dictionary = super().to_dict()
-        dictionary["data"] = self.get_data_tuple()
+        dictionary["data"] = list(self.get_data_tuple())
         return dictionary
 
-    def get_data_tuple(self) -> tuple[list, list, list]:
-        """Get the data as a picklable tuple."""
+    def get_data_tuple(self) -> tuple[numpy.ndarray, ...]:
+        """Get the data as a tuple of readonly arrays sharing the memory."""
         holder = self.props.data
         return (
-            utilities.bytes_to_list(holder.get_xdata_b()),
-            utilities.bytes_to_list(holder.get_lower_b()),
-            utilities.bytes_to_list(holder.get_upper_b()),
+            utilities.bytes_to_ndarray(holder.get_xdata_b()),
+            utilities.bytes_to_ndarray(holder.get_lower_b()),
+            utilities.bytes_to_ndarray(holder.get_upper_b()),
         )
 
-    def set_data_tuple(self, data: tuple[list, list, list]) -> None:
-        """Set the data from a tuple."""
-        self.props.data = Graphs.FillHolder.new(*data)
+    def set_data_tuple(self, data: tuple) -> None:
+        """Set the data from a tuple, sharing the unchanged columns."""
+        self.props.data = utilities.new_fill_holder(*data)
 
 
 class ItemFactory(Graphs.ItemFactory):
@@ -320,11 +323,16 @@ class ItemFactory(Graphs.ItemFactory):
         match dictionary["type"]:
             case "DataItem":
                 dictionary.pop("type")
-                dictionary["data"] = Graphs.DataHolder.new(*dictionary["data"])
+                data = dictionary["data"]
+                data_types = dictionary.pop("data_types", None)
+                if data_types is not None:
+                    data = list(map(utilities.to_column, data, data_types))
+                dictionary["data"] = utilities.new_data_holder(*data)
                 return DataItem(**dictionary)
             case "GeneratedDataItem":
                 dictionary.pop("type")
-                dictionary["data"] = Graphs.DataHolder.new(*dictionary["data"])
+                data = dictionary["data"]
+                dictionary["data"] = utilities.new_data_holder(*data)
                 equation = Graphs.expression_to_ast(dictionary["equation"])
                 dictionary["equation"] = equation
                 return GeneratedDataItem(**dictionary)
@@ -338,7 +346,8 @@ class ItemFactory(Graphs.ItemFactory):
                 return TextItem(**dictionary)
             case "FillItem":
                 dictionary.pop("type")
-                dictionary["data"] = Graphs.FillHolder.new(*dictionary["data"])
+                data = dictionary["data"]
+                dictionary["data"] = utilities.new_fill_holder(*data)
                 return FillItem(**dictionary)
             case _:
                 raise ValueError(f"could not find type {dictionary['type']}")
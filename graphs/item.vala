@@ -52,6 +52,10 @@ namespace Graphs {
             return instance.data_item_request.emit (parameters, new DataHolder ((owned) xdata, (owned) ydata, (owned) xerr, (owned) yerr));
         }
 
+        public static DataItem new_data_item_with_holder (StyleParameters parameters, DataHolder holder) {
+            return instance.data_item_request.emit (parameters, holder);
+        }
+
         public static GeneratedDataItem new_generated_data_item (StyleParameters parameters, Ast equation, string xstart, string xstop, int steps, Scale scale) {
             return instance.generated_data_item_request.emit (parameters, equation, xstart, xstop, steps, scale);
         }
@@ -103,56 +107,303 @@ namespace Graphs {
         public abstract Ast equation { get; set; }
     }
 
+    /**
+     * Storage type of a DataHolder column.
+     */
+    public enum ColumnType {
+        FLOAT64,
+        FLOAT32,
+        INT32,
+        UINT16;
+
+        /**
+         * Convert a column stored as this type to doubles.
+         */
+        public double[] to_doubles (Bytes bytes) {
+            double[] column;
+            switch (this) {
+                case FLOAT32:
+                    unowned float[] floats = (float[]) bytes.get_data ();
+                    column = new double[floats.length];
+                    for (int i = 0; i < floats.length; i++) column[i] = floats[i];
+                    break;
+                case INT32:
+                    unowned int32[] ints = (int32[]) bytes.get_data ();
+                    column = new double[ints.length];
+                    for (int i = 0; i < ints.length; i++) column[i] = ints[i];
+                    break;
+                case UINT16:
+                    unowned uint16[] shorts = (uint16[]) bytes.get_data ();
+                    column = new double[shorts.length];
+                    for (int i = 0; i < shorts.length; i++) column[i] = shorts[i];
+                    break;
+                default:
+                    column = ((double[]) bytes.get_data ()).copy ();
+                    break;
+            }
+            return column;
+        }
+
+        /**
+         * Store a column of doubles as this type.
+         *
+         * All values must be exactly representable by the type, see
+         * for_values.
+         */
+        public Bytes from_doubles (double[] column) {
+            switch (this) {
+                case FLOAT32:
+                    var floats = new float[column.length];
+                    for (int i = 0; i < column.length; i++) floats[i] = (float) column[i];
+                    return new Bytes.take ((uint8[]) (owned) floats);
+                case INT32:
+                    var ints = new int32[column.length];
+                    for (int i = 0; i < column.length; i++) ints[i] = (int32) column[i];
+                    return new Bytes.take ((uint8[]) (owned) ints);
+                case UINT16:
+                    var shorts = new uint16[column.length];
+                    for (int i = 0; i < column.length; i++) shorts[i] = (uint16) column[i];
+                    return new Bytes.take ((uint8[]) (owned) shorts);
+                default:
+                    return new Bytes ((uint8[]) column);
+            }
+        }
+
+        /**
+         * Get the smallest type holding all values of a column exactly.
+         */
+        public static ColumnType for_values (double[] column) {
+            if (column.length == 0) return FLOAT64;
+            bool uint16_values = true;
+            bool int32_values = true;
+            bool float32_values = true;
+            foreach (double val in column) {
+                if (!val.is_finite () || val != Math.trunc (val)) {
+                    uint16_values = int32_values = false;
+                } else {
+                    if (val < 0 || val > uint16.MAX) uint16_values = false;
+                    if (val < int32.MIN || val > int32.MAX) int32_values = false;
+                }
+                if (!val.is_nan () && (double) (float) val != val) float32_values = false;
+                if (!int32_values && !float32_values) return FLOAT64;
+            }
+            if (uint16_values) return UINT16;
+            if (int32_values) return INT32;
+            return FLOAT32;
+        }
+    }
+
+    private struct ColumnRange {
+        public bool computed;
+        public bool valid;
+        public double min;
+        public double max;
+    }
+
+    /**
+     * Immutable container for the columns of a DataItem.
+     *
+     * Columns are stored as Bytes, so they can be shared between holders
+     * and handed out without copying. Columns can be stored with a smaller
+     * ColumnType, in which case they are converted to doubles on first use
+     * by code that needs doubles.
+     */
     public class DataHolder : Object {
-        private double[] _xdata;
-        private double[] _ydata;
-        private double[]? _xerr;
-        private double[]? _yerr;
+        private Bytes _xdata;
+        private Bytes _ydata;
+        private Bytes? _xerr;
+        private Bytes? _yerr;
+
+        // Types of the x, y, xerr and yerr columns and their double copies
+        private ColumnType[] _types = {
+            ColumnType.FLOAT64, ColumnType.FLOAT64,
+            ColumnType.FLOAT64, ColumnType.FLOAT64,
+        };
+        private Bytes?[] _doubles = new Bytes?[4];
+
+        // Finite ranges indexed by column * 2 + ignore_zero
+        private ColumnRange[] _ranges = new ColumnRange[4];
+
+        // Boolean mask of the points next to singularity jumps
+        private bool _bad_points_computed = false;
+        private Bytes? _bad_points = null;
 
         public DataHolder (owned double[] xdata, owned double[] ydata, owned double[]? xerr, owned double[]? yerr) {
-            _xdata = (owned) xdata;
-            _ydata = (owned) ydata;
-            _xerr = (owned) xerr;
-            _yerr = (owned) yerr;
+            this.with_xdata (take_column ((owned) xdata), (owned) ydata, (owned) xerr, (owned) yerr);
+        }
+
+        /**
+         * Create a holder sharing an existing x column.
+         */
+        public DataHolder.with_xdata (Bytes xdata, owned double[] ydata, owned double[]? xerr, owned double[]? yerr) {
+            this.from_bytes (
+                xdata,
+                take_column ((owned) ydata),
+                xerr == null ? null : take_column ((owned) xerr),
+                yerr == null ? null : take_column ((owned) yerr)
+            );
+        }
+
+        /**
+         * Create a holder referencing existing columns.
+         *
+         * Columns are immutable, so holders can share the columns that did
+         * not change instead of copying them.
+         */
+        public DataHolder.from_bytes (Bytes xdata, Bytes ydata, Bytes? xerr, Bytes? yerr) {
+            _xdata = xdata;
+            _ydata = ydata;
+            _xerr = xerr;
+            _yerr = yerr;
+        }
+
+        /**
+         * Create a holder referencing existing columns of the given types.
+         *
+         * Types holds the types of the x, y, xerr and yerr columns.
+         */
+        public DataHolder.typed (Bytes xdata, Bytes ydata, Bytes? xerr, Bytes? yerr, ColumnType[] types)
+            requires (types.length == 4) {
+            this.from_bytes (xdata, ydata, xerr, yerr);
+            _types = types;
+        }
+
+        /**
+         * Create a holder storing each column in the smallest ColumnType
+         * holding all of its values exactly.
+         *
+         * Used by importers, as imported columns often hold integer counts.
+         */
+        public DataHolder.compact (owned double[] xdata, owned double[] ydata, owned double[]? xerr, owned double[]? yerr) {
+            _xdata = take_compact_column (0, (owned) xdata);
+            _ydata = take_compact_column (1, (owned) ydata);
+            _xerr = take_compact_column (2, (owned) xerr);
+            _yerr = take_compact_column (3, (owned) yerr);
+        }
+
+        /**
+         * Create a compact holder sharing an existing x column of doubles.
+         */
+        public DataHolder.compact_with_xdata (Bytes xdata, owned double[] ydata, owned double[]? xerr, owned double[]? yerr) {
+            _xdata = xdata;
+            _ydata = take_compact_column (1, (owned) ydata);
+            _xerr = take_compact_column (2, (owned) xerr);
+            _yerr = take_compact_column (3, (owned) yerr);
         }
 
         public DataHolder.empty () {
-            _xdata = new double[0];
-            _ydata = new double[0];
-            _xerr = null;
-            _yerr = null;
+            this ({}, {}, null, null);
+        }
+
+        /**
+         * Wrap a column in Bytes without copying it.
+         */
+        public static Bytes take_column (owned double[] column) {
+            return new Bytes.take ((uint8[]) (owned) column);
+        }
+
+        /**
+         * Wrap a column in Bytes of the smallest type holding it exactly.
+         */
+        private Bytes? take_compact_column (int index, owned double[]? column) {
+            if (column == null) return null;
+            ColumnType type = ColumnType.for_values (column);
+            _types[index] = type;
+            if (type == ColumnType.FLOAT64) return take_column ((owned) column);
+            return type.from_doubles (column);
         }
 
         public unowned double[] get_xdata () {
-            return _xdata;
+            return get_doubles (0, _xdata);
         }
 
         public unowned double[] get_ydata () {
-            return _ydata;
+            return get_doubles (1, _ydata);
         }
 
         public unowned double[]? get_xerr () {
-            return _xerr;
+            return get_doubles (2, _xerr);
         }
 
         public unowned double[]? get_yerr () {
-            return _yerr;
+            return get_doubles (3, _yerr);
+        }
+
+        /**
+         * Get the type of the x (0), y (1), xerr (2) or yerr (3) column.
+         */
+        public ColumnType get_column_type (int column)
+            requires (column >= 0 && column < 4) {
+            return _types[column];
+        }
+
+        private unowned double[]? get_doubles (int column, Bytes? bytes) {
+            if (bytes == null) return null;
+            ColumnType type = _types[column];
+            if (type == ColumnType.FLOAT64) return (double[]) bytes.get_data ();
+            if (_doubles[column] == null) {
+                _doubles[column] = take_column (type.to_doubles (bytes));
+            }
+            return (double[]) _doubles[column].get_data ();
         }
 
         public Bytes get_xdata_b () {
-            return new Bytes ((uint8[]) _xdata);
+            return _xdata;
         }
 
         public Bytes get_ydata_b () {
-            return new Bytes ((uint8[]) _ydata);
+            return _ydata;
         }
 
         public Bytes? get_xerr_b () {
-            return _xerr == null ? null : new Bytes ((uint8[]) _xerr);
+            return _xerr;
         }
 
         public Bytes? get_yerr_b () {
-            return _yerr == null ? null : new Bytes ((uint8[]) _yerr);
+            return _yerr;
+        }
+
+        /**
+         * Get the finite range of the x (0) or y (1) column.
+         *
+         * With ignore_zero, zeros are skipped as well. The range is
+         * computed on first use and kept, as the columns never change.
+         */
+        public bool get_range (int column, bool ignore_zero, out double min, out double max) {
+            ColumnRange* range = &_ranges[column * 2 + (ignore_zero ? 1 : 0)];
+            if (!range->computed) {
+                unowned double[] data = column == 0 ? get_xdata () : get_ydata ();
+                double min_value, max_value;
+                range->valid = CUtilities.array_minmax (data, ignore_zero, out min_value, out max_value);
+                range->min = min_value;
+                range->max = max_value;
+                range->computed = true;
+            }
+            min = range->min;
+            max = range->max;
+            return range->valid;
+        }
+
+        /**
+         * Get the stored mask of the points next to singularity jumps.
+         *
+         * Returns whether a mask was stored. The mask is null if the data
+         * has no jumps.
+         */
+        public bool get_bad_points (out Bytes? mask) {
+            mask = _bad_points;
+            return _bad_points_computed;
+        }
+
+        /**
+         * Store the mask of the points next to singularity jumps.
+         *
+         * The mask is detected by the artists and kept with the columns, as
+         * they never change.
+         */
+        public void set_bad_points (Bytes? mask) {
+            _bad_points = mask;
+            _bad_points_computed = true;
         }
     }
 
@@ -275,44 +526,53 @@ namespace Graphs {
     }
 
     public class FillHolder : Object {
-        private double[] _xdata;
-        private double[] _lower;
-        private double[] _upper;
+        private Bytes _xdata;
+        private Bytes _lower;
+        private Bytes _upper;
 
         public FillHolder (owned double[] xdata, owned double[] lower, owned double[] upper) {
-            _xdata = (owned) xdata;
-            _lower = (owned) lower;
-            _upper = (owned) upper;
+            this.from_bytes (
+                DataHolder.take_column ((owned) xdata),
+                DataHolder.take_column ((owned) lower),
+                DataHolder.take_column ((owned) upper)
+            );
+        }
+
+        /**
+         * Create a holder referencing existing columns of doubles.
+         */
+        public FillHolder.from_bytes (Bytes xdata, Bytes lower, Bytes upper) {
+            _xdata = xdata;
+            _lower = lower;
+            _upper = upper;
         }
 
         public FillHolder.empty () {
-            _xdata = new double[0];
-            _lower = new double[0];
-            _upper = new double[0];
+            this ({}, {}, {});
         }
 
         public unowned double[] get_xdata () {
-            return _xdata;
+            return (double[]) _xdata.get_data ();
         }
 
         public unowned double[] get_lower () {
-            return _lower;
+            return (double[]) _lower.get_data ();
         }
 
         public unowned double[] get_upper () {
-            return _upper;
+            return (double[]) _upper.get_data ();
         }
 
         public Bytes get_xdata_b () {
-            return new Bytes ((uint8[]) _xdata);
+            return _xdata;
         }
 
         public Bytes get_lower_b () {
-            return new Bytes ((uint8[]) _lower);
+            return _lower;
         }
 
         public Bytes get_upper_b () {
-            return new Bytes ((uint8[]) _upper);
+            return _upper;
         }
     }
 
@@ -30,6 +30,144 @@ ipow (gdouble base, gint exp)
   return result;
 }
 
+/* Evaluate the program for point i. Inputs are stored column after column,
+ * so input k of point i lives at inputs[k * stride + i]. */
+static inline gdouble
+eval_point (const GraphsOpCode *program, const gdouble *data,
+            const gint *slots, const gdouble *params, gsize plen,
+            const gdouble *inputs, gsize stride, gsize i)
+{
+  gdouble stack[STACK_MAX] = { 0 };
+  gsize sp = 0;
+
+  gsize dc = 0;
+  gsize sc = 0;
+#pragma omp simd
+  for (gsize pc = 0; pc < plen; pc++)
+    {
+
+      gdouble a, b;
+
+      switch (program[pc])
+        {
+
+        case GRAPHS_OP_CODE_PUSH_CONST:
+          stack[sp++] = data[dc++];
+          break;
+
+        case GRAPHS_OP_CODE_PUSH_X:
+          stack[sp++] = inputs[i];
+          break;
+
+        case GRAPHS_OP_CODE_PUSH_VAR:
+          stack[sp++] = inputs[slots[sc++] * stride + i];
+          break;
+
+        case GRAPHS_OP_CODE_PUSH_PARAM:
+          stack[sp++] = params[slots[sc++]];
+          break;
+
+        case GRAPHS_OP_CODE_ADD:
+          b = stack[--sp];
+          a = stack[--sp];
+          stack[sp++] = a + b;
+          break;
+
+        case GRAPHS_OP_CODE_SUB:
+          b = stack[--sp];
+          a = stack[--sp];
+          stack[sp++] = a - b;
+          break;
+
+        case GRAPHS_OP_CODE_MUL:
+          b = stack[--sp];
+          a = stack[--sp];
+          stack[sp++] = a * b;
+          break;
+
+        case GRAPHS_OP_CODE_DIV:
+          b = stack[--sp];
+          a = stack[--sp];
+          stack[sp++] = a / b;
+          break;
+
+        case GRAPHS_OP_CODE_POW:
+          b = stack[--sp];
+          a = stack[--sp];
+          stack[sp++] = pow (a, b);
+          break;
+
+        case GRAPHS_OP_CODE_IPOW:
+          b = stack[--sp];
+          a = stack[--sp];
+          stack[sp++] = ipow (a, b);
+          break;
+
+        case GRAPHS_OP_CODE_NEG:
+          stack[sp - 1] = -stack[sp - 1];
+          break;
+
+        case GRAPHS_OP_CODE_INV:
+          stack[sp - 1] = 1 / stack[sp - 1];
+          break;
+
+        case GRAPHS_OP_CODE_FACT:
+          stack[sp - 1] = factorial (stack[sp - 1]);
+          break;
+
+        case GRAPHS_OP_CODE_SIN:
+          stack[sp - 1] = sin (stack[sp - 1]);
+          break;
+
+        case GRAPHS_OP_CODE_COS:
+          stack[sp - 1] = cos (stack[sp - 1]);
+          break;
+
+        case GRAPHS_OP_CODE_TAN:
+          stack[sp - 1] = tan (stack[sp - 1]);
+          break;
+
+        case GRAPHS_OP_CODE_ASIN:
+          stack[sp - 1] = asin (stack[sp - 1]);
+          break;
+
+        case GRAPHS_OP_CODE_ACOS:
+          stack[sp - 1] = acos (stack[sp - 1]);
+          break;
+
+        case GRAPHS_OP_CODE_ATAN:
+          stack[sp - 1] = atan (stack[sp - 1]);
+          break;
+
+        case GRAPHS_OP_CODE_LN:
+          stack[sp - 1] = log (stack[sp - 1]);
+          break;
+
+        case GRAPHS_OP_CODE_LOG2:
+          stack[sp - 1] = log2 (stack[sp - 1]);
+          break;
+
+        case GRAPHS_OP_CODE_LOG10:
+          stack[sp - 1] = log10 (stack[sp - 1]);
+          break;
+
+        case GRAPHS_OP_CODE_SQRT:
+          stack[sp - 1] = sqrt (stack[sp - 1]);
+          break;
+
+        case GRAPHS_OP_CODE_EXP:
+          stack[sp - 1] = exp (stack[sp - 1]);
+          break;
+
+        case GRAPHS_OP_CODE_ABS:
+          stack[sp - 1] = fabs (stack[sp - 1]);
+          break;
+        }
+    }
+
+  return stack[0];
+}
+
 void
 eval_array (const GraphsOpCode *program, const gdouble *data, gsize plen,
             const gdouble *restrict xdata, gdouble *restrict ydata, gsize n)
@@ -37,128 +175,61 @@ eval_array (const GraphsOpCode *program, const gdouble *data, gsize plen,
 #pragma omp parallel for schedule(static)
   for (gsize i = 0; i < n; i++)
     {
+      ydata[i] = eval_point (program, data, NULL, NULL, plen, xdata, n, i);
+    }
+}
 
-      gdouble stack[STACK_MAX] = { 0 };
-      gsize sp = 0;
+void
+eval_array_multi (const GraphsOpCode *program, const gdouble *data,
+                  const gint *slots, const gdouble *params, gsize plen,
+                  const gdouble *restrict inputs, gdouble *restrict ydata,
+                  gsize n)
+{
+#pragma omp parallel for schedule(static)
+  for (gsize i = 0; i < n; i++)
+    {
+      ydata[i] = eval_point (program, data, slots, params, plen, inputs, n, i);
+    }
+}
 
-      gdouble x = xdata[i];
+void
+eval_ranges (gpointer *programs, gpointer *data, const gsize *plens,
+             gsize n_programs, const gdouble *restrict xdata, gsize n,
+             const gboolean *ignore_zero, gdouble *out_min, gdouble *out_max,
+             gboolean *out_valid)
+{
+#pragma omp parallel for schedule(dynamic)
+  for (gsize p = 0; p < n_programs; p++)
+    {
+      const GraphsOpCode *program = programs[p];
+      const gdouble *program_data = data[p];
+      gdouble minv = INFINITY;
+      gdouble maxv = -INFINITY;
 
-      gsize dc = 0;
-#pragma omp simd
-      for (gsize pc = 0; pc < plen; pc++)
+      for (gsize i = 0; i < n; i++)
         {
+          gdouble v = eval_point (program, program_data, NULL, NULL, plens[p],
+                                  xdata, n, i);
+
+          if (!isfinite (v) || (ignore_zero[p] && v == 0.0))
+            continue;
+
+          if (v < minv)
+            minv = v;
 
-          gdouble a, b;
-
-          switch (program[pc])
-            {
-
-            case GRAPHS_OP_CODE_PUSH_CONST:
-              stack[sp++] = data[dc++];
-              break;
-
-            case GRAPHS_OP_CODE_PUSH_X:
-              stack[sp++] = x;
-              break;
-
-            case GRAPHS_OP_CODE_ADD:
-              b = stack[--sp];
-              a = stack[--sp];
-              stack[sp++] = a + b;
-              break;
-
-            case GRAPHS_OP_CODE_SUB:
-              b = stack[--sp];
-              a = stack[--sp];
-              stack[sp++] = a - b;
-              break;
-
-            case GRAPHS_OP_CODE_MUL:
-              b = stack[--sp];
-              a = stack[--sp];
-              stack[sp++] = a * b;
-              break;
-
-            case GRAPHS_OP_CODE_DIV:
-              b = stack[--sp];
-              a = stack[--sp];
-              stack[sp++] = a / b;
-              break;
-
-            case GRAPHS_OP_CODE_POW:
-              b = stack[--sp];
-              a = stack[--sp];
-              stack[sp++] = pow (a, b);
-              break;
-
-            case GRAPHS_OP_CODE_IPOW:
-              b = stack[--sp];
-              a = stack[--sp];
-              stack[sp++] = ipow (a, b);
-              break;
-
-            case GRAPHS_OP_CODE_NEG:
-              stack[sp - 1] = -stack[sp - 1];
-              break;
-
-            case GRAPHS_OP_CODE_INV:
-              stack[sp - 1] = 1 / stack[sp - 1];
-              break;
-
-            case GRAPHS_OP_CODE_FACT:
-              stack[sp - 1] = factorial (stack[sp - 1]);
-              break;
-
-            case GRAPHS_OP_CODE_SIN:
-              stack[sp - 1] = sin (stack[sp - 1]);
-              break;
-
-            case GRAPHS_OP_CODE_COS:
-              stack[sp - 1] = cos (stack[sp - 1]);
-              break;
-
-            case GRAPHS_OP_CODE_TAN:
-              stack[sp - 1] = tan (stack[sp - 1]);
-              break;
-
-            case GRAPHS_OP_CODE_ASIN:
-              stack[sp - 1] = asin (stack[sp - 1]);
-              break;
-
-            case GRAPHS_OP_CODE_ACOS:
-              stack[sp - 1] = acos (stack[sp - 1]);
-              break;
-
-            case GRAPHS_OP_CODE_ATAN:
-              stack[sp - 1] = atan (stack[sp - 1]);
-              break;
-
-            case GRAPHS_OP_CODE_LN:
-              stack[sp - 1] = log (stack[sp - 1]);
-              break;
-
-            case GRAPHS_OP_CODE_LOG2:
-              stack[sp - 1] = log2 (stack[sp - 1]);
-              break;
-
-            case GRAPHS_OP_CODE_LOG10:
-              stack[sp - 1] = log10 (stack[sp - 1]);
-              break;
-
-            case GRAPHS_OP_CODE_SQRT:
-              stack[sp - 1] = sqrt (stack[sp - 1]);
-              break;
-
-            case GRAPHS_OP_CODE_EXP:
-              stack[sp - 1] = exp (stack[sp - 1]);
-              break;
-
-            case GRAPHS_OP_CODE_ABS:
-              stack[sp - 1] = fabs (stack[sp - 1]);
-              break;
-            }
+          if (v > maxv)
+            maxv = v;
         }
 
-      ydata[i] = stack[0];
+      out_min[p] = minv;
+      out_max[p] = maxv;
+      out_valid[p] = minv <= maxv;
     }
 }
+
+gdouble
+eval_scalar (const GraphsOpCode *program, const gdouble *data, gsize plen,
+             gdouble x)
+{
+  return eval_point (program, data, NULL, NULL, plen, &x, 1, 0);
+}
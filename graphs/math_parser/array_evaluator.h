@@ -11,3 +11,16 @@ gdouble ipow (gdouble base, gint exp);
 void eval_array (const GraphsOpCode *program, const gdouble *data, gsize plen,
                  const gdouble *restrict xdata, gdouble *restrict ydata,
                  gsize n);
+
+void eval_array_multi (const GraphsOpCode *program, const gdouble *data,
+                       const gint *slots, const gdouble *params, gsize plen,
+                       const gdouble *restrict inputs, gdouble *restrict ydata,
+                       gsize n);
+
+void eval_ranges (gpointer *programs, gpointer *data, const gsize *plens,
+                  gsize n_programs, const gdouble *restrict xdata, gsize n,
+                  const gboolean *ignore_zero, gdouble *out_min,
+                  gdouble *out_max, gboolean *out_valid);
+
+gdouble eval_scalar (const GraphsOpCode *program, const gdouble *data,
+                     gsize plen, gdouble x);
@@ -179,6 +179,8 @@ namespace Graphs {
         // control
         PUSH_CONST,
         PUSH_X,
+        PUSH_VAR,
+        PUSH_PARAM,
 
         // basic operands
         ADD,
@@ -215,11 +217,25 @@ namespace Graphs {
         private OpCode[] _program;
         private double[] _data;
         private int _plen;
+        private int[] _slots;
+        private int _n_inputs;
+        private int _n_params;
 
-        public Program (owned OpCode[] program, owned double[] data, int plen) {
+        public Program (owned OpCode[] program, owned double[] data, int plen, owned int[] slots = {}, int n_inputs = 1, int n_params = 0) {
             this._program = (owned) program;
             this._data = (owned) data;
             this._plen = plen;
+            this._slots = (owned) slots;
+            this._n_inputs = n_inputs;
+            this._n_params = n_params;
+        }
+
+        public int get_n_inputs () {
+            return _n_inputs;
+        }
+
+        public int get_n_params () {
+            return _n_params;
         }
 
         public double[] eval (double[] input) {
@@ -227,5 +243,48 @@ namespace Graphs {
             MathParser.eval_array (_program, _data, _plen, input, output, input.length);
             return output;
         }
+
+        public double eval_at (double x) {
+            return MathParser.eval_scalar (_program, _data, _plen, x);
+        }
+
+        /**
+         * Evaluate the finite range of several programs over the same input.
+         *
+         * The programs are evaluated in parallel without storing the
+         * evaluated values. Zeros are skipped for programs with ignore_zero
+         * set, and valid is false for programs without any finite value.
+         */
+        public static void eval_ranges (Program[] programs, double[] input, bool[] ignore_zero, double[] min, double[] max, bool[] valid)
+            requires (ignore_zero.length == programs.length)
+            requires (min.length == programs.length)
+            requires (max.length == programs.length)
+            requires (valid.length == programs.length) {
+            var opcodes = new void*[programs.length];
+            var data = new void*[programs.length];
+            var plens = new size_t[programs.length];
+            for (int i = 0; i < programs.length; i++) {
+                opcodes[i] = programs[i]._program;
+                data[i] = programs[i]._data;
+                plens[i] = programs[i]._plen;
+            }
+            MathParser.eval_ranges (opcodes, data, plens, programs.length, input, input.length, ignore_zero, min, max, valid);
+        }
+
+        /**
+         * Evaluate a program with multiple inputs and parameters.
+         *
+         * The inputs are stored column after column, so the length of inputs
+         * must be a multiple of the number of inputs. Parameters can change
+         * between calls without recompiling the program.
+         */
+        public double[] eval_multi (double[] inputs, double[] parameters)
+            requires (inputs.length % _n_inputs == 0)
+            requires (parameters.length >= _n_params) {
+            int n = inputs.length / _n_inputs;
+            double[] output = new double[n];
+            MathParser.eval_array_multi (_program, _data, _slots, parameters, _plen, inputs, output, n);
+            return output;
+        }
     }
 }
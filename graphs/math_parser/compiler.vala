@@ -6,7 +6,11 @@ namespace Graphs.MathParser {
         private int n_ops;
         private double[] data;
         private int n_data;
-        private unowned string variable_name;
+        private int[] slots;
+        private int n_slots;
+        private unowned string[] variables;
+        private unowned string[] parameters;
+        private string variable_name;
 
         private static Once<Compiler> _instance;
 
@@ -15,11 +19,18 @@ namespace Graphs.MathParser {
         }
 
         public Program compile (Ast expr, string variable) throws MathError {
+            return compile_multi (expr, { variable }, {});
+        }
+
+        public Program compile_multi (Ast expr, string[] variables, string[] parameters) throws MathError {
             this.program = new OpCode[16];
             this.n_ops = 0;
             this.data = new double[8];
             this.n_data = 0;
-            this.variable_name = variable;
+            this.slots = new int[4];
+            this.n_slots = 0;
+            this.variables = variables;
+            this.parameters = parameters;
 
             if (!emit (expr.root ())) {
                 throw new MathError.UNKNOWN_FUNCTION ("invalid variable: " + variable_name);
@@ -28,7 +39,10 @@ namespace Graphs.MathParser {
             /* At this point program may have more memory allocated than we
              * actually use. Since we only ever use this in the array
              * evaluator we do not need to shrink here */
-            return new Program ((owned) this.program, (owned) this.data, n_ops);
+            return new Program (
+                (owned) this.program, (owned) this.data, n_ops,
+                (owned) this.slots, variables.length, parameters.length
+            );
         }
 
         private void add_instruction (OpCode op) {
@@ -60,16 +74,39 @@ namespace Graphs.MathParser {
             }
         }
 
+        private void add_slot (OpCode op, int slot) {
+            if (n_slots >= slots.length) slots.resize (slots.length * 2);
+
+            slots[n_slots++] = slot;
+
+            add_instruction (op);
+        }
+
         private bool variable (Expression expr) {
-            if (expr.name () != variable_name) {
-                // We can safely override the variable_name here as we no longer
-                // need to check it as is this the error path.
-                this.variable_name = expr.name ();
-                return false;
+            unowned string name = expr.name ();
+
+            // The primary input keeps its dedicated instruction
+            if (name == variables[0]) {
+                add_instruction (OpCode.PUSH_X);
+                return true;
+            }
+
+            for (int i = 1; i < variables.length; i++) {
+                if (name == variables[i]) {
+                    add_slot (OpCode.PUSH_VAR, i);
+                    return true;
+                }
+            }
+
+            for (int i = 0; i < parameters.length; i++) {
+                if (name == parameters[i]) {
+                    add_slot (OpCode.PUSH_PARAM, i);
+                    return true;
+                }
             }
 
-            add_instruction (OpCode.PUSH_X);
-            return true;
+            this.variable_name = name;
+            return false;
         }
 
         private bool unary (Expression expr) {
@@ -45,6 +45,18 @@ namespace Graphs {
         return MathParser.Compiler.instance ().compile (simplified, variable);
     }
 
+    /**
+     * Convert an AST to an executable array program with multiple inputs and
+     * scalar parameters.
+     *
+     * The first variable is the primary input. Unlike ast_to_program, the
+     * expression is compiled as is without simplifying it first.
+     */
+    public static Program ast_to_multi_program (Ast expression, string[] variables, string[] parameters = {}) throws MathError
+        requires (variables.length > 0) {
+        return MathParser.Compiler.instance ().compile_multi (expression, variables, parameters);
+    }
+
     namespace MathParser {
         [CCode (cname = "factorial", cheader_filename = "math_parser/array_evaluator.h")]
         private extern double factorial (double x);
@@ -65,5 +77,55 @@ namespace Graphs {
             double[] ydata,
             size_t n
         );
+
+        [CCode (cname = "eval_array_multi", cheader_filename = "math_parser/array_evaluator.h")]
+        private extern void eval_array_multi (
+            [CCode (array_length = false)]
+            OpCode[] program,
+            [CCode (array_length = false)]
+            double[] data,
+            [CCode (array_length = false)]
+            int[] slots,
+            [CCode (array_length = false)]
+            double[] parameters,
+            size_t plen,
+            [CCode (array_length = false)]
+            double[] inputs,
+            [CCode (array_length = false)]
+            double[] ydata,
+            size_t n
+        );
+
+        [CCode (cname = "eval_ranges", cheader_filename = "math_parser/array_evaluator.h")]
+        private extern void eval_ranges (
+            [CCode (array_length = false)]
+            void*[] programs,
+            [CCode (array_length = false)]
+            void*[] data,
+            [CCode (array_length = false)]
+            size_t[] plens,
+            size_t n_programs,
+            [CCode (array_length = false)]
+            double[] xdata,
+            size_t n,
+            [CCode (array_length = false)]
+            bool[] ignore_zero,
+            [CCode (array_length = false)]
+            double[] out_min,
+            [CCode (array_length = false)]
+            double[] out_max,
+            [CCode (array_length = false)]
+            bool[] out_valid
+        );
+
+        [CCode (cname = "eval_scalar", cheader_filename = "math_parser/array_evaluator.h")]
+        private extern double eval_scalar (
+            [CCode (array_length = false)]
+            OpCode[] program,
+            [CCode (array_length = false)]
+            double[] data,
+            size_t plen,
+            double x
+        );
     }
 }
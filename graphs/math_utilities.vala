@@ -116,6 +116,18 @@ namespace Graphs.MathTools {
         return ast_to_program (expr, variable).eval (input);
     }
 
+    /**
+     * Evaluate a program with multiple inputs and parameters.
+     *
+     * The inputs are passed as doubles stored column after column, and the
+     * result is returned as doubles.
+     */
+    public static Bytes evaluate_program (Program program, Bytes inputs, double[] parameters) {
+        unowned double[] input = (double[]) inputs.get_data ();
+        double[] output = program.eval_multi (input, parameters);
+        return new Bytes ((uint8[]) output);
+    }
+
     public static DataHolder program_to_data (Program program, double xstart, double xstop, int steps = 5000, Scale scale = Scale.LINEAR) throws MathError {
         double[] xdata = new double[steps];
         CUtilities.create_equidistant_data (xstart, xstop, scale, xdata);
@@ -133,6 +145,134 @@ namespace Graphs.MathTools {
         return program_to_data (ast_to_program (equation), xstart, xstop, steps, scale);
     }
 
+    private const int NARROWING_STEPS = 64;
+    private const double BLOWUP_FACTOR = 1e3;
+
+    /**
+     * Numerically locate the singularities of a program within an interval.
+     *
+     * The program is sampled on an equidistant grid. Brackets containing a
+     * sign change are bisected and local maxima in magnitude are narrowed down
+     * with a ternary search. A bracket is only reported when the magnitude
+     * blows up while narrowing, so roots and smooth extrema are discarded.
+     */
+    public static double[] find_singularities (Program program, double xstart, double xstop, int steps = 5000, Scale scale = Scale.LINEAR) {
+        double[] singularities = {};
+        if (steps < 2) return singularities;
+        double[] xdata = new double[steps];
+        if (!CUtilities.create_equidistant_data (xstart, xstop, scale, xdata)) return singularities;
+        double[] ydata = program.eval (xdata);
+
+        double singularity;
+        if (find_endpoint_singularity (program, xdata[0], xdata[1], ydata[0], ydata[1], out singularity)) {
+            singularities += singularity;
+        }
+
+        for (int i = 0; i < steps - 1; i++) {
+            double current = ydata[i];
+            double next = ydata[i + 1];
+
+            if (current.is_finite () && next.is_finite () && current * next < 0) {
+                if (bisect_sign_change (program, xdata[i], xdata[i + 1], current, next, out singularity)) {
+                    singularities += singularity;
+                }
+                continue;
+            }
+
+            if (i == 0) continue;
+            double previous = ydata[i - 1];
+            if (!previous.is_finite () || !next.is_finite ()) continue;
+
+            // An isolated non-finite sample is a direct hit
+            if (!current.is_finite ()) {
+                singularities += xdata[i];
+                continue;
+            }
+
+            double magnitude = Math.fabs (current);
+            if (previous * current > 0 && current * next > 0
+                && magnitude > Math.fabs (previous) && magnitude >= Math.fabs (next)) {
+                if (narrow_peak (program, xdata[i - 1], xdata[i + 1], magnitude, out singularity)) {
+                    singularities += singularity;
+                }
+            }
+        }
+
+        if (find_endpoint_singularity (program, xdata[steps - 1], xdata[steps - 2], ydata[steps - 1], ydata[steps - 2], out singularity)) {
+            singularities += singularity;
+        }
+
+        return singularities;
+    }
+
+    /**
+     * Check for a singularity at an end of the sampled interval.
+     *
+     * The brackets above need finite samples on both sides, so poles lying
+     * exactly on an end point are checked separately against the sample
+     * next to it.
+     */
+    private static bool find_endpoint_singularity (Program program, double end, double inner, double fend, double finner, out double singularity) {
+        singularity = end;
+        if (!finner.is_finite ()) return false;
+        if (!fend.is_finite ()) return true;
+
+        double magnitude = Math.fabs (fend);
+        if (fend * finner <= 0 || magnitude <= Math.fabs (finner)) return false;
+        return narrow_peak (program, double.min (end, inner), double.max (end, inner), magnitude, out singularity);
+    }
+
+    private static bool bisect_sign_change (Program program, double lower, double upper, double flower, double fupper, out double singularity) {
+        double reference = Math.fmax (Math.fabs (flower), Math.fabs (fupper));
+
+        for (int i = 0; i < NARROWING_STEPS; i++) {
+            double middle = 0.5 * (lower + upper);
+            if (middle <= lower || middle >= upper) break;
+
+            double fmiddle = program.eval_at (middle);
+            if (!fmiddle.is_finite ()) {
+                singularity = middle;
+                return true;
+            }
+
+            if ((fmiddle < 0) == (flower < 0)) {
+                lower = middle;
+                flower = fmiddle;
+            } else {
+                upper = middle;
+                fupper = fmiddle;
+            }
+        }
+
+        singularity = 0.5 * (lower + upper);
+        return Math.fmin (Math.fabs (flower), Math.fabs (fupper)) > BLOWUP_FACTOR * reference;
+    }
+
+    private static bool narrow_peak (Program program, double lower, double upper, double reference, out double singularity) {
+        for (int i = 0; i < NARROWING_STEPS; i++) {
+            double left = lower + (upper - lower) / 3;
+            double right = upper - (upper - lower) / 3;
+            if (left <= lower || right >= upper || left >= right) break;
+
+            double fleft = Math.fabs (program.eval_at (left));
+            double fright = Math.fabs (program.eval_at (right));
+            if (!fleft.is_finite () || !fright.is_finite ()) {
+                singularity = fleft.is_finite () ? right : left;
+                return true;
+            }
+
+            if (fleft < fright) {
+                lower = left;
+            } else {
+                upper = right;
+            }
+        }
+
+        singularity = 0.5 * (lower + upper);
+        double peak = Math.fabs (program.eval_at (singularity));
+        return !peak.is_finite () || peak > BLOWUP_FACTOR * reference;
+    }
+
     private const double[] XDATA = { 0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10 };
 
     public static bool validate_expression (Ast expression) {
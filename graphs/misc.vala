@@ -98,7 +98,8 @@ namespace Graphs {
         ITEM_ADDED,
         ITEM_REMOVED,
         ITEMS_SWAPPED,
-        FIGURE_SETTINGS_CHANGED
+        FIGURE_SETTINGS_CHANGED,
+        ITEMS_SELECTED
     }
 
     public enum Mode {
@@ -296,7 +296,7 @@ class CommonOperations():
                 else:  # Apply linear scaling
                     new_ydata = ydata + shift_value
                 if interaction_mode == Graphs.Mode.SELECT:
-                    item_ydata = item.get_ydata().copy()
+                    item_ydata = item.get_ydata().astype(numpy.float64)
                     item_ydata[data_mask] = new_ydata
                     new_ydata = item_ydata
                 item.set_xydata((item.get_xdata(), new_ydata))
@@ -451,8 +451,8 @@ class EquationOperations():
             "y_std": numpy.std(ydata),
             "x_median": numpy.median(xdata),
             "y_median": numpy.median(ydata),
-            "x_sum": sum(xdata),
-            "y_sum": sum(ydata),
+            "x_sum": numpy.sum(xdata, dtype=numpy.float64),
+            "y_sum": numpy.sum(ydata, dtype=numpy.float64),
         }
 
         for key, value in local_dict.items():
@@ -467,6 +467,21 @@ class EquationOperations():
 _return = (numpy.ndarray, numpy.ndarray, bool, bool)
 
 
+def _merge_selection(
+    column: numpy.ndarray,
+    selected: numpy.ndarray,
+    new_selected: numpy.ndarray,
+    mask: numpy.ndarray,
+) -> numpy.ndarray:
+    """Write the new values of the selection into a copy of column."""
+    if new_selected is selected:
+        return column
+    # Results of operations on integer columns are usually no longer integers
+    column = column.astype(numpy.result_type(column, new_selected))
+    column[mask] = new_selected
+    return column
+
+
 class DataOperations():
     """Operations to be performed on data items."""
 
@@ -495,11 +510,16 @@ class DataOperations():
             if not mask.any():
                 return False, _("No data found within the highlighted area")
             xdata, ydata = xdata[mask], ydata[mask]
+        # Integer columns would wrap or truncate, so operate on doubles
+        values = (
+            xdata.astype(numpy.float64, copy=False),
+            ydata.astype(numpy.float64, copy=False),
+        )
         try:
             callback = getattr(DataOperations, name)
             message = ""
             new_xdata, new_ydata, sort, discard = callback(
-                item, xdata, ydata, *args,
+                item, *values, *args,
             )
         except NotImplementedError:
             return False, _("Operation not supported for data items")
@@ -507,6 +527,11 @@ class DataOperations():
         except (RuntimeError, ValueError, KeyError, SyntaxError) as exception:
             message = _("{name}: Error performing the operation")
             return False, message.format(name=exception.__class__.__name__)
+        # Columns returned unchanged keep their original type and data
+        if new_xdata is values[0]:
+            new_xdata = xdata
+        if new_ydata is values[1]:
+            new_ydata = ydata
         xerr = item.get_xerr()
         yerr = item.get_yerr()
         if interaction_mode == Graphs.Mode.SELECT:
@@ -523,12 +548,14 @@ class DataOperations():
                 yerr = yerr[~mask] if yerr is not None else None
             else:
                 logging.debug("Discard is false")
-                xdata = item.get_xdata().copy()
-                ydata = item.get_ydata().copy()
-                xdata[mask] = new_xdata
-                ydata[mask] = new_ydata
-                new_xdata, new_ydata = xdata, ydata
-        if sort:
+                # Columns the operation left untouched keep sharing the data
+                new_xdata = _merge_selection(
+                    item.get_xdata(), xdata, new_xdata, mask,
+                )
+                new_ydata = _merge_selection(
+                    item.get_ydata(), ydata, new_ydata, mask,
+                )
+        if sort and numpy.any(numpy.diff(new_xdata) < 0):
             logging.debug("Sorting data")
             idx = numpy.argsort(new_xdata)
             new_xdata, new_ydata = new_xdata[idx], new_ydata[idx]
@@ -635,6 +662,7 @@ class DataOperations():
         Depending on the key, will center either on the middle coordinate, or
         on the maximum value of the data
         """
+        xdata = numpy.asarray(xdata, dtype=numpy.float64)
         if center_maximum == 0:  # Center at maximum Y
             middle_index = numpy.argmax(ydata)
             middle_value = xdata[middle_index]
@@ -700,17 +728,23 @@ class DataOperations():
             "y_std": numpy.std(ydata),
             "x_median": numpy.median(xdata),
             "y_median": numpy.median(ydata),
-            "x_sum": sum(xdata),
-            "y_sum": sum(ydata),
+            "x_sum": numpy.sum(xdata, dtype=numpy.float64),
+            "y_sum": numpy.sum(ydata, dtype=numpy.float64),
         }
 
-        expr_x = ast.sympify(Graphs.expression_to_ast(input_x)).subs(ld)
-        expr_y = ast.sympify(Graphs.expression_to_ast(input_y)).subs(ld)
+        variables = ["x", "y"]
+        parameters = list(ld.keys())
+        values = list(ld.values())
 
-        f_x = sympy.lambdify((misc.X, misc.Y), expr_x, modules="scipy")
-        f_y = sympy.lambdify((misc.X, misc.Y), expr_y, modules="scipy")
+        program_x = Graphs.ast_to_multi_program(
+            Graphs.expression_to_ast(input_x), variables, parameters,
+        )
+        program_y = Graphs.ast_to_multi_program(
+            Graphs.expression_to_ast(input_y), variables, parameters,
+        )
 
-        out_x = f_x(xdata, ydata)
-        out_y = f_y(xdata, ydata)
+        inputs = (xdata, ydata)
+        out_x = utilities.evaluate_program(program_x, inputs, values)
+        out_y = utilities.evaluate_program(program_y, inputs, values)
 
         return out_x, out_y, True, discard
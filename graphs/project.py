@@ -14,7 +14,7 @@ import gio_pyio
 from graphs import migrate
 from graphs.item import ItemFactory
 
-CURRENT_PROJECT_VERSION = 2
+CURRENT_PROJECT_VERSION = 3
 
 
 class ProjectParseError(Exception):
@@ -190,6 +190,20 @@ class ProjectMigrator:
             history_states[state_index][0] = new_state
         self._project_dict["history-states"] = history_states
 
+    def _migrate_v3(self):
+        logging.debug("migrating project v2 to v3")
+        # Data changes now end with the column types of the old and new data.
+        # Until now all columns were stored as float64
+        for history_state in self._project_dict["history-states"]:
+            for change_type, change in history_state[0]:
+                if change_type != Graphs.ChangeType.ITEM_PROPERTY_CHANGED:
+                    continue
+                if change[1] != "data" or len(change) > 4:
+                    continue
+                change.extend(
+                    ["float64"] * len(value) for value in change[2:4]
+                )
+
     def _migrate_inserted_scale(self, scale_index: int) -> None:
         """Handle a new scale being inserted at scale_index."""
         figure_settings = self._project_dict["figure-settings"]
@@ -269,6 +283,9 @@ class ProjectValidator:
                         self.items.insert(change[1], self.items.pop(change[0]))
                     case Graphs.ChangeType.FIGURE_SETTINGS_CHANGED:
                         self.figure_settings.set_property(change[0], change[2])
+                    case Graphs.ChangeType.ITEMS_SELECTED:
+                        for index, value in zip(*change):
+                            self.items[index].set_selected(value)
             history_pos += 1
         for history_state in reversed(history_states):
             limits = history_state[1]
@@ -291,6 +308,9 @@ class ProjectValidator:
                         self.items.insert(change[0], self.items.pop(change[1]))
                     case Graphs.ChangeType.FIGURE_SETTINGS_CHANGED:
                         self.figure_settings.set_property(change[0], change[1])
+                    case Graphs.ChangeType.ITEMS_SELECTED:
+                        for index, value in zip(*change):
+                            self.items[index].set_selected(not value)
 
 
 def read_project_file(
@@ -325,6 +345,14 @@ def read_project_file(
     return project_dict
 
 
+def _to_json(value):
+    """Convert the data arrays kept in the history to lists."""
+    try:
+        return value.tolist()
+    except AttributeError:
+        raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
 def save_project_dict(file: Gio.File, project_dict: dict) -> None:
     """Save a project dict to a file."""
     project_dict["project-version"] = CURRENT_PROJECT_VERSION
@@ -334,4 +362,5 @@ def save_project_dict(file: Gio.File, project_dict: dict) -> None:
             wrapper,
             indent=None,
             sort_keys=True,
+            default=_to_json,
         )
@@ -4,9 +4,10 @@ from gi.repository import Gio, Graphs
 
 import gio_pyio
 
-from graphs import ast, curve_fitting, misc, operations
+from graphs import ast, curve_fitting, figure_export, operations
 from graphs.canvas import Canvas
 from graphs.figure import Figure
+from graphs.singularities import find_singularities
 from graphs.style_editor.editor_box import StyleEditorBox
 from graphs.window import PythonWindow
 
@@ -15,7 +16,6 @@ from matplotlib import rcParams, rcParamsDefault
 import numpy
 
 import sympy
-from sympy.calculus.singularities import singularities
 
 _REQUESTS = (
     "create-canvas",
@@ -99,31 +99,17 @@ class PythonHelper(Graphs.PythonHelper):
                 data,
                 figure_settings=data.get_figure_settings(),
             )
-
-            vector_formats = ["pdf", "eps", "ps", "svg"]
-            fmt = settings.get_string("file-format")
-            dpi = 100 if fmt.lower() in vector_formats else figure.get_dpi()
-            width_inches = settings.get_int("width") / dpi
-            height_inches = settings.get_int("height") / dpi
-            figure.set_size_inches(width_inches, height_inches)
-            figure.savefig(
+            figure_export.export_figure(
+                figure,
                 file_like,
-                format=fmt,
-                dpi=dpi,
+                settings.get_string("file-format"),
+                settings.get_int("width"),
+                settings.get_int("height"),
                 transparent=settings.get_boolean("transparent"),
-                bbox_inches=None,
+                rasterize=settings.get_string("rasterize-data"),
+                raster_dpi=settings.get_int("raster-dpi"),
             )
 
-    @staticmethod
-    def _on_has_singularities_request(
-        self,
-        equation: str,
-        xstart: float,
-        xstop: float,
-    ) -> None:
-        domain = sympy.Interval(xstart, xstop)
-        return singularities(ast.sympify(equation), misc.X, domain)
-
     @staticmethod
     def _on_perform_operation_request(
         self,
@@ -139,3 +125,16 @@ class PythonHelper(Graphs.PythonHelper):
     @staticmethod
     def _on_simplify_expression_request(self, expression: str) -> str:
         return str(sympy.simplify(ast.sympify(expression)))
+
+    @staticmethod
+    def _on_has_singularities_request(
+        self,
+        equation: Graphs.Ast,
+        program: Graphs.Program,
+        xstart: float,
+        xstop: float,
+        scale: Graphs.Scale,
+    ) -> bool:
+        return bool(
+            find_singularities(equation, program, xstart, xstop, scale),
+        )
@@ -33,11 +33,6 @@ namespace Graphs {
             instance.export_figure_request.emit (file, settings, data);
         }
 
-        public signal bool has_singularities_request (Ast equation, double xstart, double xstop);
-        public static bool has_singularities (Ast equation, double xstart, double xstop) {
-            return instance.has_singularities_request.emit (equation, xstart, xstop);
-        }
-
         protected signal void perform_operation_request (Window window, string name);
         public static void perform_operation (Window window, string name) {
             instance.perform_operation_request.emit (window, name);
@@ -54,5 +49,10 @@ namespace Graphs {
                 return expression_to_ast (instance.simplify_expression_request.emit (input));
             } catch (MathError e) { assert_not_reached (); }
         }
+
+        protected signal bool has_singularities_request (Ast equation, Program program, double xstart, double xstop, Scale scale);
+        public static bool has_singularities (Ast equation, Program program, double xstart, double xstop, Scale scale) {
+            return instance.has_singularities_request.emit (equation, program, xstart, xstop, scale);
+        }
     }
 }
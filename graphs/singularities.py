@@ -0,0 +1,179 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""
+Shared cache for equation singularities.
+
+Singularities are detected numerically on the compiled program and cached
+per canonical expression and scale, so identical equations share results
+across figures, exports and dialogs.
+
+With the `symbolic-singularities` setting enabled, intervals in which the
+numeric detection finds nothing are checked again with sympy. This is
+slow, but catches poles narrower than the sampling grid.
+"""
+from collections import OrderedDict
+from collections.abc import Callable
+
+from gi.repository import Graphs
+
+from graphs import ast, misc
+
+import sympy
+from sympy.calculus.singularities import singularities
+
+STEPS = 5000
+
+
+class SingularityCache:
+    """
+    LRU cache of singularities keyed by expression and scale.
+
+    Every entry keeps a sorted list of disjoint intervals that have already
+    been analysed together with the singularities found in them. Lookups only
+    compute the gaps of the requested interval that are not covered yet.
+    """
+
+    def __init__(
+        self,
+        compute: Callable[[str, object, float, float, int], list[float]],
+        maxsize: int = 64,
+    ):
+        self._compute = compute
+        self._maxsize = maxsize
+        self._entries = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(
+        self,
+        expression: str,
+        program: object,
+        lower: float,
+        upper: float,
+        scale: int,
+    ) -> list[float]:
+        """Get the sorted singularities of expression in [lower, upper]."""
+        key = (expression, scale)
+        try:
+            intervals = self._entries[key]
+            self._entries.move_to_end(key)
+        except KeyError:
+            intervals = []
+            self._entries[key] = intervals
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+        for gap_lower, gap_upper in self._gaps(intervals, lower, upper):
+            found = self._compute(
+                expression, program, gap_lower, gap_upper, scale,
+            )
+            intervals.append((gap_lower, gap_upper, sorted(found)))
+        self._entries[key] = intervals = self._merge(intervals)
+
+        return [
+            singularity
+            for interval_lower, interval_upper, found in intervals
+            if interval_upper >= lower and interval_lower <= upper
+            for singularity in found
+            if lower <= singularity <= upper
+        ]
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        self._entries.clear()
+
+    @staticmethod
+    def _gaps(intervals: list, lower: float, upper: float) -> list:
+        """Get the parts of [lower, upper] not covered by intervals."""
+        gaps = []
+        position = lower
+        for interval_lower, interval_upper, _found in intervals:
+            if interval_upper < position:
+                continue
+            if interval_lower > upper:
+                break
+            if interval_lower > position:
+                gaps.append((position, interval_lower))
+            position = max(position, interval_upper)
+        if position < upper:
+            gaps.append((position, upper))
+        return gaps
+
+    @staticmethod
+    def _merge(intervals: list) -> list:
+        """Sort intervals and merge the ones that touch or overlap."""
+        merged = []
+        for interval_lower, interval_upper, found in sorted(
+            intervals,
+            key=lambda interval: interval[0],
+        ):
+            if merged and interval_lower <= merged[-1][1]:
+                previous_lower, previous_upper, previous_found = merged[-1]
+                merged[-1] = (
+                    previous_lower,
+                    max(previous_upper, interval_upper),
+                    sorted(set(previous_found) | set(found)),
+                )
+            else:
+                merged.append((interval_lower, interval_upper, found))
+        return merged
+
+
+def _compute(
+    _expression: str,
+    program: Graphs.Program,
+    lower: float,
+    upper: float,
+    scale: Graphs.Scale,
+) -> list[float]:
+    # Gaps border on intervals scanned before, pad them by one sample step
+    # so a pole on a shared boundary is inside a scan instead of on its end.
+    padding = 1 / (STEPS - 1)
+    return Graphs.math_tools_find_singularities(
+        program,
+        Graphs.get_value_at_fraction(-padding, lower, upper, scale),
+        Graphs.get_value_at_fraction(1 + padding, lower, upper, scale),
+        STEPS,
+        scale,
+    )
+
+
+def _compute_with_fallback(
+    expression: str,
+    program: Graphs.Program,
+    lower: float,
+    upper: float,
+    scale: Graphs.Scale,
+) -> list[float]:
+    found = _compute(expression, program, lower, upper, scale)
+    if found:
+        return found
+    expr = ast.sympify(Graphs.expression_to_ast(expression))
+    result = singularities(expr, misc.X, sympy.Interval(lower, upper))
+    if not isinstance(result, sympy.FiniteSet):
+        return []
+    return [float(value) for value in result if value.is_real]
+
+
+def _use_symbolic_fallback() -> bool:
+    """Whether the symbolic fallback is enabled, never when headless."""
+    settings = Graphs.Application.get_settings()
+    return settings is not None \
+        and settings.get_boolean("symbolic-singularities")
+
+
+_cache = SingularityCache(_compute)
+_fallback_cache = SingularityCache(_compute_with_fallback)
+
+
+def find_singularities(
+    equation: Graphs.Ast,
+    program: Graphs.Program,
+    lower: float,
+    upper: float,
+    scale: Graphs.Scale,
+) -> list[float]:
+    """Get the sorted singularities of an equation in [lower, upper]."""
+    expression = Graphs.ast_to_expression(equation)
+    cache = _fallback_cache if _use_symbolic_fallback() else _cache
+    return cache.get(expression, program, lower, upper, scale)
@@ -3,12 +3,23 @@
 #include <math.h>
 #include <omp.h>
 #include <stdlib.h>
+#include <string.h>
 
 #define MIN_LOG_VALUE 1e-300
 #define MAX_LOG_VALUE 1e300
 
+/*
+ * Below this number of elements the kernels stay on one thread, as starting
+ * the thread team costs more than the loop itself.
+ */
+#define PARALLEL_MIN_LEN 100000
+
 /*
  * Small helper to find the min and max value of a double array.
+ *
+ * Runs as a single pass, the number of valid values is reduced alongside
+ * the min and max, which keeps the loop vectorizable and lets it run
+ * across threads.
  */
 gboolean
 array_minmax (const gdouble *restrict data, gsize len, gboolean ignore_zero,
@@ -19,48 +30,21 @@ array_minmax (const gdouble *restrict data, gsize len, gboolean ignore_zero,
 
   gdouble minv = INFINITY;
   gdouble maxv = -INFINITY;
-  gboolean found = FALSE;
+  gsize n_valid = 0;
 
-/*
- * OpenMP SIMD reductions:
- * - reduction(min:maxv)
- * - reduction(max:minv)
- *
- * We cannot safely reduce a bool, so track validity separately.
- */
-#pragma omp simd reduction(min : minv) reduction(max : maxv)
+#pragma omp parallel for simd if (len >= PARALLEL_MIN_LEN)                  \
+    reduction(min : minv) reduction(max : maxv) reduction(+ : n_valid)
   for (gsize i = 0; i < len; i++)
     {
-      gdouble v = data[i];
-
-      if (!isfinite (v) || (ignore_zero && v == 0.0))
-        continue;
+      const gdouble v = data[i];
+      const gboolean valid = isfinite (v) && !(ignore_zero && v == 0.0);
 
-      if (v < minv)
-        minv = v;
-
-      if (v > maxv)
-        maxv = v;
+      minv = valid && v < minv ? v : minv;
+      maxv = valid && v > maxv ? v : maxv;
+      n_valid += valid;
     }
 
-/*
- * Second pass to determine whether at least one
- * valid value existed.
- *
- * This keeps the SIMD loop vectorizable.
- */
-#pragma omp simd reduction(|| : found)
-  for (gsize i = 0; i < len; i++)
-    {
-      gdouble v = data[i];
-
-      if (!isfinite (v) || (ignore_zero && v == 0.0))
-        continue;
-
-      found = TRUE;
-    }
-
-  if (!found)
+  if (n_valid == 0)
     return FALSE;
 
   *out_min = minv;
@@ -74,13 +58,11 @@ finite_double (const gdouble *restrict data, gsize len)
 {
   gboolean found = FALSE;
 
-#pragma omp simd reduction(|| : found)
+#pragma omp parallel for simd if (len >= PARALLEL_MIN_LEN)                  \
+    reduction(|| : found)
   for (gsize i = 0; i < len; i++)
     {
-      if (!isfinite (data[i]))
-        continue;
-
-      found = TRUE;
+      found = found || isfinite (data[i]);
     }
 
   return found;
@@ -232,51 +214,53 @@ create_equidistant_data (gdouble start, gdouble stop, GraphsScale scale,
   return TRUE;
 }
 
+/*
+ * Remove the points with a non-finite y value, returning the new length.
+ *
+ * Every thread compacts its own chunk in place towards the start of that
+ * chunk, after which the compacted chunks are moved next to each other.
+ * Threads never touch each others chunks, so the in place compaction is
+ * free of races.
+ */
 gsize
-filter_nonfinite (gdouble *xdata, gdouble *ydata, gsize n)
+filter_nonfinite (gdouble *restrict xdata, gdouble *restrict ydata, gsize n)
 {
   if (!xdata || !ydata || n == 0)
     return 0;
 
-  gchar *mask = (gchar *)g_malloc_n (n, sizeof (gchar));
-  gsize *prefix = (gsize *)g_malloc_n (n, sizeof (gsize));
+  const gint n_chunks = n < PARALLEL_MIN_LEN ? 1 : omp_get_max_threads ();
+  gsize *counts = g_new (gsize, n_chunks);
 
-  if (!mask || !prefix)
+#pragma omp parallel for schedule(static, 1) if (n_chunks > 1)
+  for (gint chunk = 0; chunk < n_chunks; chunk++)
     {
-      free (mask);
-      free (prefix);
-      return 0;
-    }
+      const gsize start = n / n_chunks * chunk;
+      const gsize end = chunk == n_chunks - 1 ? n : start + n / n_chunks;
+      gsize dst = start;
 
-    /* Build a mask for finite values */
-#pragma omp parallel for
-  for (gsize i = 0; i < n; ++i)
-    {
-      mask[i] = isfinite (ydata[i]) ? 1 : 0;
-    }
+      for (gsize i = start; i < end; i++)
+        {
+          const gdouble y = ydata[i];
 
-  /* Build a prefix sum - carries loop depenency */
-  int count = 0;
-  for (gsize i = 0; i < n; ++i)
-    {
-      prefix[i] = count;
-      count += mask[i];
+          xdata[dst] = xdata[i];
+          ydata[dst] = y;
+          dst += isfinite (y) ? 1 : 0;
+        }
+
+      counts[chunk] = dst - start;
     }
 
-    /* Compact data in place */
-#pragma omp parallel for
-  for (gsize i = 0; i < n; ++i)
+  gsize count = counts[0];
+  for (gint chunk = 1; chunk < n_chunks; chunk++)
     {
-      if (mask[i])
-        {
-          gsize dst = prefix[i];
-          xdata[dst] = xdata[i];
-          ydata[dst] = ydata[i];
-        }
+      const gsize start = n / n_chunks * chunk;
+
+      memmove (xdata + count, xdata + start, counts[chunk] * sizeof (gdouble));
+      memmove (ydata + count, ydata + start, counts[chunk] * sizeof (gdouble));
+      count += counts[chunk];
     }
 
-  g_free (mask);
-  g_free (prefix);
+  g_free (counts);
 
   return count;
 }
@@ -5,27 +5,138 @@ from gi.repository import GLib, Graphs
 import numpy
 
 
-def bytes_to_ndarray(b: GLib.Bytes) -> numpy.ndarray:
+# Numpy types of the DataHolder column types
+COLUMN_DTYPES = {
+    Graphs.ColumnType.FLOAT64: numpy.dtype(numpy.float64),
+    Graphs.ColumnType.FLOAT32: numpy.dtype(numpy.float32),
+    Graphs.ColumnType.INT32: numpy.dtype(numpy.int32),
+    Graphs.ColumnType.UINT16: numpy.dtype(numpy.uint16),
+}
+_COLUMN_TYPES = {dtype: key for key, dtype in COLUMN_DTYPES.items()}
+
+
+class _Column(numpy.ndarray):
+    """Readonly array remembering the GLib.Bytes it was read from."""
+
+    source = None
+
+    def __array_finalize__(self, _obj) -> None:
+        # Slices, copies and results of operations are new columns
+        self.source = None
+
+    def __deepcopy__(self, memo: dict):
+        # Readonly columns can be shared between history states
+        if not self.flags.writeable:
+            return self
+        return super().__deepcopy__(memo)
+
+
+def bytes_to_ndarray(
+    b: GLib.Bytes,
+    dtype: numpy.dtype = numpy.float64,
+) -> numpy.ndarray:
     """Get a readonly ndarray referencing the original data."""
     if b is None:
         return None
-    return numpy.frombuffer(b.get_data(), dtype=numpy.float64)
+    array = numpy.frombuffer(b.get_data(), dtype=dtype).view(_Column)
+    array.source = b
+    return array
 
 
-def bytes_to_list(b: GLib.Bytes) -> list[float]:
-    """Get a python list as copy of the original data."""
-    if b is None:
+def to_column(values, dtype: numpy.dtype = numpy.float64) -> numpy.ndarray:
+    """Get a readonly copy of values, shared instead of copied by deepcopy."""
+    if values is None:
         return None
-    return bytes_to_ndarray(b).tolist()
+    array = numpy.array(values, dtype=dtype).view(_Column)
+    array.flags.writeable = False
+    return array
+
+
+def compact_column(values) -> numpy.ndarray:
+    """
+    Get values as an array of the smallest column type holding them exactly.
+
+    Python counterpart of DataHolder.compact for importers.
+    """
+    array = numpy.asarray(values, dtype=numpy.float64)
+    if array.size == 0:
+        return array
+    for dtype in (numpy.uint16, numpy.int32, numpy.float32):
+        with numpy.errstate(invalid="ignore", over="ignore"):
+            column = array.astype(dtype)
+        if numpy.array_equal(column, array, equal_nan=True):
+            return column
+    return array
+
+
+def ndarray_to_bytes(array: numpy.ndarray) -> GLib.Bytes:
+    """
+    Get an array as GLib.Bytes holding doubles.
+
+    Double arrays read with bytes_to_ndarray reuse the Bytes they were read
+    from, anything else is copied as one block of memory.
+    """
+    source = getattr(array, "source", None)
+    if source is not None and array.dtype == numpy.float64:
+        return source
+    array = numpy.ascontiguousarray(array, dtype=numpy.float64)
+    return GLib.Bytes.new(array.tobytes())
+
+
+def column_to_bytes(column) -> tuple[GLib.Bytes, Graphs.ColumnType]:
+    """
+    Get a column as GLib.Bytes together with its column type.
+
+    Arrays of a supported column type keep their type, anything else is
+    stored as doubles. Arrays read with bytes_to_ndarray cannot be modified,
+    so the Bytes they were read from are reused instead of copying the data.
+    """
+    if column is None:
+        return None, Graphs.ColumnType.FLOAT64
+    column_type = _COLUMN_TYPES.get(
+        numpy.asarray(column).dtype, Graphs.ColumnType.FLOAT64,
+    )
+    source = getattr(column, "source", None)
+    if source is not None:
+        return source, column_type
+    array = numpy.ascontiguousarray(column, dtype=COLUMN_DTYPES[column_type])
+    return GLib.Bytes.new(array.tobytes()), column_type
+
+
+def new_data_holder(xdata, ydata, xerr=None, yerr=None) -> Graphs.DataHolder:
+    """Create a DataHolder keeping the column types of numpy arrays."""
+    columns, column_types = zip(
+        *map(column_to_bytes, (xdata, ydata, xerr, yerr)),
+    )
+    return Graphs.DataHolder.new_typed(*columns, list(column_types))
+
+
+def new_fill_holder(xdata, lower, upper) -> Graphs.FillHolder:
+    """Create a FillHolder from arrays without converting every element."""
+    return Graphs.FillHolder.new_from_bytes(
+        *map(ndarray_to_bytes, (xdata, lower, upper)),
+    )
+
+
+def get_column(holder: Graphs.DataHolder, index: int) -> numpy.ndarray:
+    """Get the x (0), y (1), xerr (2) or yerr (3) column of a holder."""
+    column = (
+        holder.get_xdata_b,
+        holder.get_ydata_b,
+        holder.get_xerr_b,
+        holder.get_yerr_b,
+    )[index]()
+    return bytes_to_ndarray(
+        column,
+        COLUMN_DTYPES[holder.get_column_type(index)],
+    )
 
 
 def get_xy_data(
     holder: Graphs.DataHolder,
 ) -> tuple[numpy.ndarray, numpy.ndarray]:
     """Get x and y data in numpy format from a DataHolder."""
-    xdata = bytes_to_ndarray(holder.get_xdata_b())
-    ydata = bytes_to_ndarray(holder.get_ydata_b())
-    return xdata, ydata
+    return get_column(holder, 0), get_column(holder, 1)
 
 
 def equation_to_data(
@@ -43,3 +154,18 @@ def equation_to_data(
         scale,
     )
     return get_xy_data(holder)
+
+
+def evaluate_program(
+    program: Graphs.Program,
+    inputs: tuple[numpy.ndarray, ...],
+    parameters: tuple[float, ...] = (),
+) -> numpy.ndarray:
+    """Evaluate a compiled program on equally sized input arrays."""
+    return bytes_to_ndarray(
+        Graphs.math_tools_evaluate_program(
+            program,
+            ndarray_to_bytes(numpy.vstack(inputs)),
+            [float(parameter) for parameter in parameters],
+        ),
+    )
@@ -169,16 +169,23 @@ namespace Graphs {
             return max_value / min_value;
         }
 
-        public string get_duplicate_string (string original, string[] used) {
-            if (!(original in used)) return original;
-            string old_str = original;
+        /**
+         * Strip a duplicate suffix like " (2)" from a string.
+         */
+        internal string strip_duplicate_suffix (string original) {
             try {
                 var regex = new Regex ("(?P<string>.+) \\(\\d+\\)");
                 MatchInfo info;
                 if (regex.match (original, 0, out info)) {
-                    old_str = info.fetch_named ("string");
+                    return info.fetch_named ("string");
                 }
             } catch {}
+            return original;
+        }
+
+        public string get_duplicate_string (string original, string[] used) {
+            if (!(original in used)) return original;
+            string old_str = strip_duplicate_suffix (original);
             uint i = 1;
             while (true) {
                 string new_str = @"$old_str ($i)";
@@ -358,4 +365,36 @@ namespace Graphs {
             return index - 1;
         }
     }
+
+    /**
+     * Set of strings handing out unique names.
+     *
+     * Names are made unique the same way as Tools.get_duplicate_string,
+     * but lookups are hashed and the next free suffix of every name is
+     * remembered, so adding many duplicates of one name stays linear.
+     */
+    public class UniqueStrings : Object {
+        private Gee.HashSet<string> _used = new Gee.HashSet<string> ();
+        private Gee.HashMap<string, uint> _next_suffix = new Gee.HashMap<string, uint> ();
+
+        public UniqueStrings (string[] used) {
+            _used.add_all_array (used);
+        }
+
+        /**
+         * Add a string, returning the unique name it was added as.
+         */
+        public string add (string original) {
+            if (_used.add (original)) return original;
+            string old_str = Tools.strip_duplicate_suffix (original);
+            uint i = _next_suffix.has_key (old_str) ? _next_suffix[old_str] : 1;
+            string new_str = @"$old_str ($i)";
+            while (!_used.add (new_str)) {
+                i++;
+                new_str = @"$old_str ($i)";
+            }
+            _next_suffix[old_str] = i + 1;
+            return new_str;
+        }
+    }
 }
@@ -0,0 +1,32 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Start the application for tests and benchmarks that need it."""
+import os
+
+from gi.repository import Gio, Graphs
+
+import graphs
+
+_application = None
+
+
+def start_application() -> Graphs.Application:
+    """
+    Register the application, running the same startup as Graphs itself.
+
+    Settings are kept in memory, so the configuration of the user is not
+    touched. The application is only started once per process.
+    """
+    global _application
+    if _application is None:
+        os.environ.setdefault("GSETTINGS_BACKEND", "memory")
+        application = Graphs.Application.new()
+        application.set_flags(
+            application.get_flags() | Gio.ApplicationFlags.NON_UNIQUE,
+        )
+        application.connect(
+            "startup",
+            lambda _app: graphs.startup(False, "", "graphs"),
+        )
+        application.register(None)
+        _application = application
+    return _application
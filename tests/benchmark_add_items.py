@@ -0,0 +1,45 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""
+Benchmark adding a large multi-column import to the data.
+
+Only uses API that predates the hash based bookkeeping of Data.add_items,
+so the same script measures the timings before and after that change.
+"""
+import time
+
+from gi.repository import Graphs
+
+from graphs.data import Data
+from graphs.item import DataItem
+
+from tests.application import start_application
+
+N_ITEMS = 10000
+BATCH_SIZES = (N_ITEMS, 1000)
+
+
+def _new_items(n_items: int) -> list[DataItem]:
+    style = Graphs.StyleManager.get_instance().get_system_style_params()
+    return [
+        DataItem.new(style, [0.0, 1.0], [0.0, 1.0], name="Column")
+        for _i in range(n_items)
+    ]
+
+
+def main():
+    """Add equally named items at once and in batches."""
+    start_application()
+    for batch_size in BATCH_SIZES:
+        data = Data()
+        batches = [
+            _new_items(batch_size) for _i in range(N_ITEMS // batch_size)
+        ]
+        start = time.perf_counter()
+        for items in batches:
+            data.add_items(items)
+        elapsed = time.perf_counter() - start
+        print(f"{N_ITEMS} items, batches of {batch_size:>5}: {elapsed:8.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+/* SPDX-License-Identifier: GPL-3.0-or-later */
+/*
+ * Micro-benchmark of the CUtilities kernels.
+ *
+ * Usage: benchmark_cutilities [N_ELEMENTS]
+ */
+#include "utilities.h"
+
+#include <math.h>
+#include <omp.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+
+#define DEFAULT_LEN 10000000
+#define REPEATS 5
+
+typedef void (*KernelFunc) (gdouble *xdata, gdouble *ydata, gsize len);
+
+static gdouble *source_x;
+static gdouble *source_y;
+
+static void
+run_minmax (G_GNUC_UNUSED gdouble *xdata, gdouble *ydata, gsize len)
+{
+  gdouble min, max;
+  array_minmax (ydata, len, TRUE, &min, &max);
+}
+
+static void
+run_finite (G_GNUC_UNUSED gdouble *xdata, gdouble *ydata, gsize len)
+{
+  finite_double (ydata, len);
+}
+
+static void
+run_equidistant (gdouble *xdata, G_GNUC_UNUSED gdouble *ydata, gsize len)
+{
+  create_equidistant_data (1.0, 1e6, GRAPHS_SCALE_LOG, xdata, len);
+}
+
+static void
+run_filter (gdouble *xdata, gdouble *ydata, gsize len)
+{
+  filter_nonfinite (xdata, ydata, len);
+}
+
+/*
+ * Time the best of a few runs, restoring the input before every run as
+ * some kernels modify their input in place.
+ */
+static void
+benchmark (const gchar *name, KernelFunc func, gdouble *xdata, gdouble *ydata,
+           gsize len)
+{
+  gint64 best = G_MAXINT64;
+
+  for (gint run = 0; run < REPEATS; run++)
+    {
+      memcpy (xdata, source_x, len * sizeof (gdouble));
+      memcpy (ydata, source_y, len * sizeof (gdouble));
+
+      gint64 start = g_get_monotonic_time ();
+      func (xdata, ydata, len);
+      best = MIN (best, g_get_monotonic_time () - start);
+    }
+
+  gdouble seconds = best / (gdouble)G_USEC_PER_SEC;
+  g_print ("%-26s %10.3f ms %8.2f Melem/s\n", name, seconds * 1e3,
+           len / seconds / 1e6);
+}
+
+int
+main (int argc, char **argv)
+{
+  gsize len = argc > 1 ? g_ascii_strtoull (argv[1], NULL, 10) : DEFAULT_LEN;
+  if (len == 0)
+    {
+      g_printerr ("Invalid number of elements: %s\n", argv[1]);
+      return EXIT_FAILURE;
+    }
+
+  source_x = g_new (gdouble, len);
+  source_y = g_new (gdouble, len);
+  gdouble *xdata = g_new (gdouble, len);
+  gdouble *ydata = g_new (gdouble, len);
+
+  /* Every 97th value is a singularity, every 89th value zero */
+  for (gsize i = 0; i < len; i++)
+    {
+      source_x[i] = i;
+      source_y[i] = i % 97 == 0   ? NAN
+                    : i % 89 == 0 ? 0.0
+                                  : sin (i * 1e-3) * i;
+    }
+
+  g_print ("%" G_GSIZE_FORMAT " elements, %d threads\n", len,
+           omp_get_max_threads ());
+  benchmark ("array_minmax", run_minmax, xdata, ydata, len);
+  benchmark ("finite_double", run_finite, xdata, ydata, len);
+  benchmark ("create_equidistant_data", run_equidistant, xdata, ydata, len);
+  benchmark ("filter_nonfinite", run_filter, xdata, ydata, len);
+
+  g_free (source_x);
+  g_free (source_y);
+  g_free (xdata);
+  g_free (ydata);
+
+  return EXIT_SUCCESS;
+}
@@ -0,0 +1,53 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Benchmark file size and time of vector exports with dense data."""
+import io
+import os
+import time
+
+from gi.repository import Gio, Graphs
+
+from graphs import figure_export, style_io
+from graphs.figure import Figure
+from graphs.item import DataItem
+from graphs.styles import StyleParameters
+
+import numpy
+
+POINTS = 1000000
+STYLE = os.path.join(
+    os.path.dirname(__file__), "..", "data", "styles", "adwaita.mplstyle",
+)
+
+
+def _new_figure(style: StyleParameters) -> Figure:
+    xdata = numpy.linspace(0, 100, POINTS)
+    ydata = numpy.sin(xdata) + numpy.random.default_rng(0).normal(
+        scale=0.1, size=POINTS,
+    )
+    items = Gio.ListStore.new(Graphs.Item)
+    items.append(DataItem.new(style, xdata.tolist(), ydata.tolist()))
+    return Figure(style, items)
+
+
+def main():
+    """Export the same figure with and without rasterized data."""
+    style = StyleParameters(style_io.parse(Gio.File.new_for_path(STYLE)))
+    for fmt in figure_export.VECTOR_FORMATS:
+        for mode in ("never", "always"):
+            buffer = io.BytesIO()
+            start = time.perf_counter()
+            figure_export.export_figure(
+                _new_figure(style),
+                buffer,
+                fmt,
+                800,
+                600,
+                rasterize=mode,
+            )
+            elapsed = time.perf_counter() - start
+            size = buffer.getbuffer().nbytes / 1e6
+            print(f"{fmt:>4} {mode:<6} {elapsed:7.2f} s {size:8.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+// SPDX-License-Identifier: GPL-3.0-or-later
+using Graphs;
+
+// Items of a large multi-column import, which all start with the same name
+private const int N_ITEMS = 10000;
+// The array based lookup scales cubically, so it only gets a smaller import
+private const int N_BASELINE_ITEMS = 500;
+
+private double name_with_array (int n_items) {
+    var timer = new Timer ();
+    string[] used = {};
+    for (int i = 0; i < n_items; i++) {
+        used += Tools.get_duplicate_string ("Column", used);
+    }
+    return timer.elapsed ();
+}
+
+private double name_with_set (int n_items) {
+    var timer = new Timer ();
+    var used = new UniqueStrings ({});
+    for (int i = 0; i < n_items; i++) {
+        used.add ("Column");
+    }
+    return timer.elapsed ();
+}
+
+void main (string[] args) {
+    print ("%6d items, array: %8.3f s\n", N_BASELINE_ITEMS, name_with_array (N_BASELINE_ITEMS));
+    print ("%6d items, set:   %8.3f s\n", N_BASELINE_ITEMS, name_with_set (N_BASELINE_ITEMS));
+    print ("%6d items, set:   %8.3f s\n", N_ITEMS, name_with_set (N_ITEMS));
+}
@@ -0,0 +1,123 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Tests for data management."""
+from gi.repository import Gio, Graphs
+
+from graphs.data import Data
+from graphs.item import DataItem
+
+import numpy
+
+import pytest
+
+from tests.application import start_application
+
+
+@pytest.fixture
+def data():
+    """Return an empty Data of a started application."""
+    start_application()
+    return Data()
+
+
+def _add_items(data: Data, n_items: int) -> None:
+    style = Graphs.StyleManager.get_instance().get_system_style_params()
+    data.add_items([
+        DataItem.new(style, [0.0, 1.0], [0.0, 1.0], name=f"Item {index}")
+        for index in range(n_items)
+    ])
+
+
+def _selection(data: Data) -> list[bool]:
+    return [item.get_selected() for item in data]
+
+
+def _assert_indices(data: Data) -> None:
+    for position, item in enumerate(data):
+        assert data.index(item) == position
+
+
+def _typed_data(offset: int) -> tuple:
+    return (
+        numpy.arange(offset, offset + 3, dtype=numpy.int32),
+        numpy.arange(offset, offset + 3, dtype=numpy.uint16),
+        None,
+        numpy.linspace(0, 1, 3, dtype=numpy.float32) + offset,
+    )
+
+
+def _assert_typed_data(item: DataItem, expected: tuple) -> None:
+    for column, expected_column in zip(item.get_data_tuple(), expected):
+        if expected_column is None:
+            assert column is None
+            continue
+        assert column.dtype == expected_column.dtype
+        assert column.tolist() == expected_column.tolist()
+
+
+def test_project_round_trip_keeps_column_types(data, tmp_path):
+    """Test if saving and reloading keeps column types through the history."""
+    style = Graphs.StyleManager.get_instance().get_system_style_params()
+    old_data, new_data = _typed_data(0), _typed_data(10)
+    data.add_items([DataItem.new(style, *old_data, name="Typed")])
+    data[0].set_data_tuple(new_data)
+    data.add_history_state()
+
+    file = Gio.File.new_for_path(str(tmp_path / "project.graphs"))
+    data.props.file = file
+    data.save()
+
+    loaded = Data()
+    loaded.load(file)
+    _assert_typed_data(loaded[0], new_data)
+    loaded.undo()
+    _assert_typed_data(loaded[0], old_data)
+    loaded.redo()
+    _assert_typed_data(loaded[0], new_data)
+
+
+def test_bulk_selection_undo_redo(data):
+    """Test if a bulk selection change is one history entry and signal."""
+    _add_items(data, 4)
+    n_states = len(data.get_project_dict()["history-states"])
+    emitted = []
+    data.connect("selection-changed", lambda *args: emitted.append(args))
+
+    data.select_range(1, 2, True)
+    data.add_history_state()
+    assert _selection(data) == [False, True, True, False]
+    assert len(emitted) == 1
+    history_states = data.get_project_dict()["history-states"]
+    assert len(history_states) == n_states + 1
+    assert [change[0] for change in history_states[-1][0]] == [
+        Graphs.ChangeType.ITEMS_SELECTED,
+    ]
+
+    data.undo()
+    assert _selection(data) == [True] * 4
+    data.redo()
+    assert _selection(data) == [False, True, True, False]
+
+
+def test_indices_follow_positions(data):
+    """Test if index matches the list position after reordering items."""
+    _add_items(data, 5)
+    _assert_indices(data)
+
+    data.change_position(0, 3)
+    _assert_indices(data)
+    data.change_position(4, 1)
+    _assert_indices(data)
+
+    names = [item.get_name() for item in data]
+    data.delete_items([data[1], data[3]])
+    assert len(data) == 3
+    _assert_indices(data)
+
+    # Undoing the removal inserts the items at their old positions again
+    data.undo()
+    assert [item.get_name() for item in data] == names
+    _assert_indices(data)
+
+    _add_items(data, 2)
+    assert len(data) == 7
+    _assert_indices(data)
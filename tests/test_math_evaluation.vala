@@ -140,6 +140,75 @@ private void test_syntax_errors () {
     }
 }
 
+private void test_multi_program () {
+    try {
+        Ast ast = expression_to_ast ("a*x + y^2 - b");
+        Program program = ast_to_multi_program (ast, { "x", "y" }, { "a", "b" });
+        assert_cmpint (program.get_n_inputs (), CompareOperator.EQ, 2);
+        assert_cmpint (program.get_n_params (), CompareOperator.EQ, 2);
+
+        double[] inputs = { 1, 2, 3, 0, 1, 2 };
+        double[] output = program.eval_multi (inputs, { 2, 1 });
+        assert_double_eq (output[0], 1);
+        assert_double_eq (output[1], 4);
+        assert_double_eq (output[2], 9);
+
+        output = program.eval_multi (inputs, { 0, 0 });
+        assert_double_eq (output[0], 0);
+        assert_double_eq (output[2], 4);
+    } catch (Error e) {
+        Test.fail_printf (e.message);
+    }
+}
+
+private void test_multi_program_unknown_variable () {
+    try {
+        Ast ast = expression_to_ast ("a*x + z");
+        ast_to_multi_program (ast, { "x" }, { "a" });
+        Test.fail_printf ("z should have been an invalid variable");
+    } catch (MathError e) {
+        if (e.code != MathError.UNKNOWN_FUNCTION)
+            Test.fail_printf (e.message);
+    }
+}
+
+
+private const double SINGULARITY_EPSILON = 1e-6;
+
+private double[] find_singularities (string expression, double xstart, double xstop) {
+    try {
+        Program program = ast_to_program (expression_to_ast (expression));
+        return MathTools.find_singularities (program, xstart, xstop);
+    } catch (Error e) {
+        Test.fail_printf ("%s: %s", expression, e.message);
+        return {};
+    }
+}
+
+private void assert_singularities (string expression, double xstart, double xstop, double[] expected) {
+    double[] singularities = find_singularities (expression, xstart, xstop);
+    assert_cmpint (singularities.length, CompareOperator.EQ, expected.length);
+    for (int i = 0; i < expected.length; i++) {
+        assert_true (Math.fabs (singularities[i] - expected[i]) < SINGULARITY_EPSILON);
+    }
+}
+
+private void test_singularities_poles () {
+    assert_singularities ("tan(x)", -5, 5, { -3 * Math.PI_2, -Math.PI_2, Math.PI_2, 3 * Math.PI_2 });
+    assert_singularities ("1/x", -1, 1, { 0 });
+}
+
+private void test_singularities_root () {
+    assert_singularities ("x", -1, 1, {});
+}
+
+private void test_singularities_sharp_peak () {
+    assert_singularities ("exp(-10000*x^2)", -1, 1, {});
+}
+
+private void test_singularities_endpoint () {
+    assert_singularities ("1/x", 0, 1, { 0 });
+}
 
 void main (string[] args) {
     Test.init (ref args);
@@ -161,6 +230,12 @@ void main (string[] args) {
     Test.add_func ("/math-parser/eval/invalid-factorial-negative", test_invalid_factorial_negative);
     Test.add_func ("/math-parser/eval/invalid-factorial-fractional", test_invalid_factorial_fractional);
     Test.add_func ("/math-parser/eval/syntax-errors", test_syntax_errors);
+    Test.add_func ("/math-parser/compile/multi-program", test_multi_program);
+    Test.add_func ("/math-parser/compile/unknown-variable", test_multi_program_unknown_variable);
+    Test.add_func ("/math-tools/singularities/poles", test_singularities_poles);
+    Test.add_func ("/math-tools/singularities/root", test_singularities_root);
+    Test.add_func ("/math-tools/singularities/sharp-peak", test_singularities_sharp_peak);
+    Test.add_func ("/math-tools/singularities/endpoint", test_singularities_endpoint);
 
     Test.run ();
 }
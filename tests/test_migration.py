@@ -103,3 +103,32 @@ def test_validator_constructs_figure_settings(validated_project):
     assert isinstance(
         validated_project.figure_settings, Graphs.FigureSettings,
     )
+
+
+def test_migration_v3_adds_data_types():
+    """Test if migrating v2 data changes records their columns as float64."""
+    old_data = [[0.0, 1.0], [2.0, 3.0], None, None]
+    new_data = [[0.0, 1.0], [4.0, 5.0], None, [0.1, 0.1]]
+    project_dict = {
+        "version": "1.8.0",
+        "project-version": 2,
+        "data": [],
+        "figure-settings": {},
+        "history-states": [[
+            [[
+                Graphs.ChangeType.ITEM_PROPERTY_CHANGED,
+                [0, "data", old_data, new_data],
+            ]],
+            [],
+        ]],
+        "history-position": -1,
+        "view-history-states": [],
+        "view-history-position": -1,
+    }
+    migrated = ProjectMigrator(
+        project_dict,
+        Graphs.ProjectParseFlags.NONE,
+    ).migrate()
+    change = migrated["history-states"][0][0][0][1]
+    assert change[2:4] == [old_data, new_data]
+    assert change[4:6] == [["float64"] * 4, ["float64"] * 4]
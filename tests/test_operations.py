@@ -75,6 +75,14 @@ def test_center_at_middle():
     )
 
 
+def test_center_unsigned():
+    """Test if center does not wrap around on unsigned integer data."""
+    xdata, ydata, _sort, _discard = DataOperations.center(
+        None, XDATA.astype(numpy.uint16), YDATA, 0,
+    )
+    assert min(xdata) == min(XDATA) - XDATA[numpy.argmax(YDATA)]
+
+
 def test_derivative():
     """Test if derivative returns the correct gradient at each point."""
     xdata = [1, 2, 3, 4, 5]
@@ -0,0 +1,62 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Tests for the singularity cache."""
+from graphs.singularities import SingularityCache
+
+POLES = [-3.0, 0.5, 2.0, 7.5]
+
+
+class _Counter:
+    """Compute callback that records the requested intervals."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, _expression, _program, lower, upper, _scale):
+        self.calls.append((lower, upper))
+        return [pole for pole in POLES if lower <= pole <= upper]
+
+
+def test_cache_hit():
+    """Test that a covered interval is not computed again."""
+    compute = _Counter()
+    cache = SingularityCache(compute)
+    assert cache.get("1/x", None, -5, 5, 0) == [-3.0, 0.5, 2.0]
+    assert cache.get("1/x", None, 0, 3, 0) == [0.5, 2.0]
+    assert compute.calls == [(-5, 5)]
+
+
+def test_only_gaps_computed():
+    """Test that only the uncovered parts of an interval are computed."""
+    compute = _Counter()
+    cache = SingularityCache(compute)
+    cache.get("1/x", None, 0, 1, 0)
+    cache.get("1/x", None, 4, 5, 0)
+    assert cache.get("1/x", None, -5, 10, 0) == POLES
+    assert compute.calls[2:] == [(-5, 0), (1, 4), (5, 10)]
+    cache.get("1/x", None, -4, 9, 0)
+    assert len(compute.calls) == 5
+
+
+def test_keys():
+    """Test that expression and scale are part of the key."""
+    compute = _Counter()
+    cache = SingularityCache(compute)
+    cache.get("1/x", None, 0, 1, 0)
+    cache.get("1/x", None, 0, 1, 1)
+    cache.get("tan(x)", None, 0, 1, 0)
+    assert len(compute.calls) == 3
+
+
+def test_eviction():
+    """Test that the least recently used entry is evicted."""
+    compute = _Counter()
+    cache = SingularityCache(compute, maxsize=2)
+    cache.get("a", None, 0, 1, 0)
+    cache.get("b", None, 0, 1, 0)
+    cache.get("a", None, 0, 1, 0)
+    cache.get("c", None, 0, 1, 0)
+    assert len(cache) == 2
+    cache.get("a", None, 0, 1, 0)
+    assert len(compute.calls) == 3
+    cache.get("b", None, 0, 1, 0)
+    assert len(compute.calls) == 4